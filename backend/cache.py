@@ -0,0 +1,185 @@
+# backend/cache.py
+
+import hashlib
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Dict, List, Optional
+
+
+class LRUCache:
+    """Thread-safe bounded LRU cache with optional TTL and hit/miss counters."""
+
+    def __init__(self, max_size: int = 10000, ttl: Optional[float] = None):
+        if not isinstance(max_size, int) or max_size <= 0:
+            raise ValueError("max_size must be a positive integer")
+        if ttl is not None and ttl <= 0:
+            raise ValueError("ttl must be a positive number of seconds")
+        self.max_size = max_size
+        self.ttl = ttl
+        self.hits = 0
+        self.misses = 0
+        self._entries = OrderedDict()  # key -> (stored_at, value)
+        self._lock = threading.Lock()
+
+    def _expired(self, stored_at: float) -> bool:
+        return self.ttl is not None and time.time() - stored_at > self.ttl
+
+    def _get_local(self, key):
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        stored_at, value = entry
+        if self._expired(stored_at):
+            del self._entries[key]
+            return None
+        self._entries.move_to_end(key)
+        return value
+
+    def _put_local(self, key, value, stored_at: Optional[float] = None):
+        self._entries[key] = (stored_at or time.time(), value)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_size:
+            self._entries.popitem(last=False)
+
+    def get(self, key, default=None):
+        """Return the cached value for key, or default on a miss."""
+        with self._lock:
+            value = self._get_local(key)
+            if value is None:
+                self.misses += 1
+                return default
+            self.hits += 1
+            return value
+
+    def put(self, key, value):
+        with self._lock:
+            self._put_local(key, value)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self.hits = 0
+            self.misses = 0
+
+    def __len__(self):
+        return len(self._entries)
+
+    def stats(self) -> Dict[str, Any]:
+        total = self.hits + self.misses
+        return {
+            "size": len(self._entries),
+            "max_size": self.max_size,
+            "ttl": self.ttl,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": round(self.hits / total, 4) if total else 0.0
+        }
+
+
+class SentimentResultCache(LRUCache):
+    """
+    Sentiment results keyed by model name plus a hash of the cleaned text.
+    With a `path`, entries are also written to SQLite so they survive restarts;
+    the in-memory LRU stays in front of the database, and both are kept to
+    `max_size` entries.
+    """
+
+    def __init__(self, model_name: str, max_size: int = 10000, ttl: Optional[float] = None,
+                 path: Optional[str] = None):
+        super().__init__(max_size=max_size, ttl=ttl)
+        self.model_name = model_name
+        self.path = path
+        self._db = None
+        self._disk_rows = 0
+
+        if path:
+            self._db = sqlite3.connect(path, check_same_thread=False)
+            self._db.execute(
+                """
+                CREATE TABLE IF NOT EXISTS sentiment_cache (
+                    key TEXT PRIMARY KEY,
+                    sentiment_score REAL,
+                    sentiment_category TEXT,
+                    stored_at REAL
+                )
+                """
+            )
+            self._db.execute(
+                "CREATE INDEX IF NOT EXISTS sentiment_cache_stored_at ON sentiment_cache (stored_at)"
+            )
+            self._prune_disk()
+            print(f"[INFO] Sentiment cache backed by {path}")
+
+    def _prune_disk(self):
+        """Keep the on-disk copy bounded as well: drop expired and least recent rows."""
+        if self.ttl is not None:
+            self._db.execute("DELETE FROM sentiment_cache WHERE stored_at < ?", (time.time() - self.ttl,))
+        self._db.execute(
+            "DELETE FROM sentiment_cache WHERE key NOT IN "
+            "(SELECT key FROM sentiment_cache ORDER BY stored_at DESC LIMIT ?)",
+            (self.max_size,)
+        )
+        self._db.commit()
+        self._disk_rows = self._db.execute("SELECT COUNT(*) FROM sentiment_cache").fetchone()[0]
+
+    def make_key(self, text: str) -> str:
+        return hashlib.sha256(f"{self.model_name}\0{text}".encode("utf-8")).hexdigest()
+
+    def _get_disk(self, key):
+        row = self._db.execute(
+            "SELECT sentiment_score, sentiment_category, stored_at FROM sentiment_cache WHERE key = ?",
+            (key,)
+        ).fetchone()
+        if row is None or self._expired(row[2]):
+            return None
+        value = {"sentiment_score": row[0], "sentiment_category": row[1]}
+        self._put_local(key, value, stored_at=row[2])
+        return value
+
+    def get_many(self, texts: List[str]) -> List[Optional[Dict[str, Any]]]:
+        """Look up each text; misses come back as None in the same position."""
+        results = []
+        with self._lock:
+            for text in texts:
+                key = self.make_key(text)
+                value = self._get_local(key)
+                if value is None and self._db is not None:
+                    value = self._get_disk(key)
+                if value is None:
+                    self.misses += 1
+                else:
+                    self.hits += 1
+                results.append(value)
+        return results
+
+    def put_many(self, texts: List[str], values: List[Dict[str, Any]]):
+        now = time.time()
+        with self._lock:
+            rows = []
+            for text, value in zip(texts, values):
+                key = self.make_key(text)
+                self._put_local(key, value, stored_at=now)
+                rows.append((key, value["sentiment_score"], value["sentiment_category"], now))
+
+            if self._db is not None and rows:
+                self._db.executemany("INSERT OR REPLACE INTO sentiment_cache VALUES (?, ?, ?, ?)", rows)
+                self._db.commit()
+                # Upper bound (replaced keys are counted too); prune once it passes max_size
+                self._disk_rows += len(rows)
+                if self._disk_rows > self.max_size:
+                    self._prune_disk()
+
+    def clear(self):
+        super().clear()
+        if self._db is not None:
+            with self._lock:
+                self._db.execute("DELETE FROM sentiment_cache")
+                self._db.commit()
+                self._disk_rows = 0
+
+    def close(self):
+        if self._db is not None:
+            self._db.close()
+            self._db = None
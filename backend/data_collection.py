@@ -1,8 +1,9 @@
 import tweepy
 import instaloader
 import json
+import math
 import time
-from typing import List, Dict, Any, Optional
+from typing import List, Dict, Any, Iterator, Optional
 import requests
 from backend.config import INSTAGRAM_CSRF_TOKEN, INSTAGRAM_DS_USER_ID, INSTAGRAM_SESSION_ID
 
@@ -12,72 +13,70 @@ class TwitterCollector:
         if not bearer_token:
             raise ValueError("Twitter bearer token is required")
         self.client = tweepy.Client(bearer_token=bearer_token)
+
+    @staticmethod
+    def _tweet_to_dict(tweet) -> Dict[str, Any]:
+        return {
+            'id': tweet.id,
+            'text': tweet.text,
+            'created_at': tweet.created_at.isoformat(),
+            'like_count': tweet.public_metrics['like_count'],
+            'retweet_count': tweet.public_metrics['retweet_count'],
+            'reply_count': tweet.public_metrics['reply_count'],
+            'platform': 'twitter'
+        }
+
+    def _iter_pages(self, method, max_results: int, page_size: int = 100, **params) -> Iterator[List[Dict[str, Any]]]:
+        """Yield one list of tweets per API page until max_results tweets were returned."""
+        page_size = min(max_results, page_size)
+        remaining = max_results
+        paginator = tweepy.Paginator(
+            method,
+            max_results=page_size,
+            limit=math.ceil(max_results / page_size),
+            tweet_fields=['created_at', 'text', 'public_metrics'],
+            **params
+        )
+        for response in paginator:
+            if not response.data:
+                continue
+            page = [self._tweet_to_dict(tweet) for tweet in response.data[:remaining]]
+            remaining -= len(page)
+            yield page
+            if remaining <= 0:
+                break
+
+    def iter_tweets_by_hashtag(self, hashtag: str, max_results: int = 50) -> Iterator[List[Dict[str, Any]]]:
+        """Page-by-page variant of fetch_tweets_by_hashtag."""
+        # Remove # if present in the hashtag
+        hashtag = hashtag.replace('#', '')
+        return self._iter_pages(self.client.search_recent_tweets, max_results,
+                                query=f"#{hashtag} -is:retweet")
+
+    def iter_tweets_by_user(self, username: str, max_results: int = 50) -> Iterator[List[Dict[str, Any]]]:
+        """Page-by-page variant of fetch_tweets_by_user."""
+        # Remove @ if present in the username
+        username = username.replace('@', '')
+
+        # Get user ID first
+        user = self.client.get_user(username=username)
+        if not user.data:
+            raise ValueError(f"User {username} not found")
+
+        return self._iter_pages(self.client.get_users_tweets, max_results, id=user.data.id)
         
     def fetch_tweets_by_hashtag(self, hashtag: str, max_results: int = 50) -> List[Dict[str, Any]]:
         """Fetch tweets containing a specific hashtag."""
-        tweets = []
         try:
-            # Remove # if present in the hashtag
-            hashtag = hashtag.replace('#', '')
-            
-            # Search for tweets with the hashtag
-            response = self.client.search_recent_tweets(
-                query=f"#{hashtag} -is:retweet", 
-                max_results=max_results,
-                tweet_fields=['created_at', 'text', 'public_metrics']
-            )
-            
-            if response.data:
-                for tweet in response.data:
-                    tweets.append({
-                        'id': tweet.id,
-                        'text': tweet.text,
-                        'created_at': tweet.created_at.isoformat(),
-                        'like_count': tweet.public_metrics['like_count'],
-                        'retweet_count': tweet.public_metrics['retweet_count'],
-                        'reply_count': tweet.public_metrics['reply_count'],
-                        'platform': 'twitter'
-                    })
-                    
-            return tweets
+            return [tweet for page in self.iter_tweets_by_hashtag(hashtag, max_results) for tweet in page]
         except Exception as e:
             print(f"Error fetching tweets: {e}")
             raise RuntimeError(f"Failed to fetch tweets: {str(e)}")
             
     def fetch_tweets_by_user(self, username: str, max_results: int = 50) -> List[Dict[str, Any]]:
         """Fetch tweets from a specific user."""
-        tweets = []
         try:
-            # Remove @ if present in the username
-            username = username.replace('@', '')
-            
-            # Get user ID first
-            user = self.client.get_user(username=username)
-            if not user.data:
-                raise ValueError(f"User {username} not found")
-                
-            user_id = user.data.id
-            
-            # Get user's tweets
-            response = self.client.get_users_tweets(
-                id=user_id,
-                max_results=max_results,
-                tweet_fields=['created_at', 'text', 'public_metrics']
-            )
-            
-            if response.data:
-                for tweet in response.data:
-                    tweets.append({
-                        'id': tweet.id,
-                        'text': tweet.text,
-                        'created_at': tweet.created_at.isoformat(),
-                        'like_count': tweet.public_metrics['like_count'],
-                        'retweet_count': tweet.public_metrics['retweet_count'],
-                        'reply_count': tweet.public_metrics['reply_count'],
-                        'platform': 'twitter'
-                    })
-            
-            return tweets
+            return [tweet for page in self.iter_tweets_by_user(username, max_results) for tweet in page]
         except Exception as e:
             print(f"Error fetching user tweets: {e}")
             raise RuntimeError(f"Failed to fetch user tweets: {str(e)}")
@@ -211,44 +210,49 @@ class InstagramCollector:
             print(f"Error fetching Instagram post: {e}")
             raise RuntimeError(f"Failed to fetch Instagram post: {str(e)}")
 
-    def fetch_hashtag_posts(self, hashtag: str, max_posts: int = 10) -> List[Dict[str, Any]]:
-        """Fetch Instagram posts using hashtag via direct API with cookies."""
-        try:
-            self._validate_credentials()
-            posts = []
-            hashtag = hashtag.replace('#', '')
-            
-            headers, _ = self._get_headers_and_cookies()
-            url = f"https://www.instagram.com/api/v1/tags/web_info/?__a=1&__d=dis&tag_name={hashtag}"
-            
-            response = requests.get(url, headers=headers)
-            if response.status_code != 200:
-                raise RuntimeError(f"Instagram API error: {response.status_code} - {response.text}")
+    def iter_hashtag_posts(self, hashtag: str, max_posts: int = 10) -> Iterator[List[Dict[str, Any]]]:
+        """Page-by-page variant of fetch_hashtag_posts: one list of posts per result section."""
+        self._validate_credentials()
+        hashtag = hashtag.replace('#', '')
+        
+        headers, _ = self._get_headers_and_cookies()
+        url = f"https://www.instagram.com/api/v1/tags/web_info/?__a=1&__d=dis&tag_name={hashtag}"
+        
+        response = requests.get(url, headers=headers)
+        if response.status_code != 200:
+            raise RuntimeError(f"Instagram API error: {response.status_code} - {response.text}")
 
-            data = response.json()
-            edges = data.get("data", {}).get("recent", {}).get("sections", [])
-            
-            count = 0
-            for section in edges:
-                for media in section.get("layout_content", {}).get("medias", []):
-                    node = media.get("media")
-                    post_data = {
-                        "id": node.get("code"),
-                        "caption": node.get("caption", {}).get("text", ""),
-                        "like_count": node.get("like_count"),
-                        "comment_count": node.get("comment_count"),
-                        "created_at": node.get("taken_at"),
-                        "hashtags": [f"#{hashtag}"],
-                        "platform": "instagram"
-                    }
-                    posts.append(post_data)
-                    count += 1
-                    if count >= max_posts:
-                        break
+        data = response.json()
+        edges = data.get("data", {}).get("recent", {}).get("sections", [])
+        
+        count = 0
+        for section in edges:
+            page = []
+            for media in section.get("layout_content", {}).get("medias", []):
+                node = media.get("media")
+                post_data = {
+                    "id": node.get("code"),
+                    "caption": node.get("caption", {}).get("text", ""),
+                    "like_count": node.get("like_count"),
+                    "comment_count": node.get("comment_count"),
+                    "created_at": node.get("taken_at"),
+                    "hashtags": [f"#{hashtag}"],
+                    "platform": "instagram"
+                }
+                page.append(post_data)
+                count += 1
                 if count >= max_posts:
                     break
+            if page:
+                yield page
+            if count >= max_posts:
+                break
 
-            print(f"Fetched {len(posts)} posts for #{hashtag}")
+    def fetch_hashtag_posts(self, hashtag: str, max_posts: int = 10) -> List[Dict[str, Any]]:
+        """Fetch Instagram posts using hashtag via direct API with cookies."""
+        try:
+            posts = [post for page in self.iter_hashtag_posts(hashtag, max_posts) for post in page]
+            print(f"Fetched {len(posts)} posts for #{hashtag.replace('#', '')}")
             return posts
             
         except Exception as e:
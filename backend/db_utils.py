@@ -59,18 +59,29 @@ def format_mysql_datetime(ts: str) -> str:
         return None
 
 
-def save_analysis_to_mysql(data, host="localhost", user="root", password="Shubham#27root", database="sentiment_db", clear_existing=False):
+def connect_mysql(host="localhost", user="root", password="Shubham#27root", database="sentiment_db"):
+    """Open a connection that can be passed to several save_analysis_to_mysql calls."""
+    return mysql.connector.connect(
+        host=host,
+        user=user,
+        password=password,
+        database=database
+    )
+
+
+def save_analysis_to_mysql(data, host="localhost", user="root", password="Shubham#27root", database="sentiment_db", clear_existing=False,
+                           progress_callback=None, progress_every=500, conn=None):
     """
     Saves sentiment analysis results to MySQL.
     If clear_existing=True, deletes old rows before inserting.
+    progress_callback(percent, rows_written) is called every `progress_every` rows and at the end.
+    With `conn` (see connect_mysql), rows go over that connection and it is
+    left open for the caller; otherwise a connection is opened and closed here.
     """
+    owns_connection = conn is None
     try:
-        conn = mysql.connector.connect(
-            host=host,
-            user=user,
-            password=password,
-            database=database
-        )
+        if owns_connection:
+            conn = connect_mysql(host, user, password, database)
         cursor = conn.cursor()
 
         # Ensure table exists
@@ -101,8 +112,9 @@ def save_analysis_to_mysql(data, host="localhost", user="root", password="Shubha
         
         successful_inserts = 0
         failed_inserts = 0
+        total = len(data)
         
-        for item in data:
+        for position, item in enumerate(data, 1):
             try:
                 formatted_timestamp = format_mysql_datetime(item.get('timestamp') or item.get('date_time'))
                 
@@ -121,10 +133,14 @@ def save_analysis_to_mysql(data, host="localhost", user="root", password="Shubha
                 print(f"[ERROR] Failed to insert item: {e}")
                 print(f"[ERROR] Problematic item: {item}")
                 failed_inserts += 1
-                continue
+
+            if progress_callback and position % progress_every == 0:
+                progress_callback(position / total * 100, successful_inserts)
 
         conn.commit()
         print(f"[INFO] Successfully inserted {successful_inserts} records, {failed_inserts} failed")
+        if progress_callback:
+            progress_callback(100.0, successful_inserts)
         
     except mysql.connector.Error as e:
         print(f"[ERROR] MySQL connection error: {e}")
@@ -135,5 +151,5 @@ def save_analysis_to_mysql(data, host="localhost", user="root", password="Shubha
     finally:
         if 'cursor' in locals():
             cursor.close()
-        if 'conn' in locals():
+        if owns_connection and conn is not None:
             conn.close()
\ No newline at end of file
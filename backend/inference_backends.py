@@ -0,0 +1,160 @@
+# backend/inference_backends.py
+
+import os
+import time
+from typing import Any, Dict, List, Optional
+
+import numpy as np
+import torch
+
+
+def _softmax(logits: np.ndarray) -> np.ndarray:
+    exp = np.exp(logits - logits.max(axis=1, keepdims=True))
+    return exp / exp.sum(axis=1, keepdims=True)
+
+
+class TorchBackend:
+    """Run the Hugging Face model directly with PyTorch."""
+
+    name = "torch"
+    tensor_type = "pt"
+
+    def __init__(self, model, device):
+        self.model = model
+        self.device = device
+
+    def predict_proba(self, inputs) -> np.ndarray:
+        inputs = inputs.to(self.device)
+        with torch.no_grad():
+            outputs = self.model(**inputs)
+            probs = torch.nn.functional.softmax(outputs.logits, dim=1)
+        return probs.cpu().numpy()
+
+
+class _LogitsOnly(torch.nn.Module):
+    """Export wrapper so the ONNX graph has a single `logits` output."""
+
+    def __init__(self, model):
+        super().__init__()
+        self.model = model
+
+    def forward(self, input_ids, attention_mask):
+        return self.model(input_ids=input_ids, attention_mask=attention_mask).logits
+
+
+class OnnxBackend:
+    """
+    Run an ONNX export of the model with onnxruntime on CPU, optionally with
+    dynamic int8 quantization. Exports are cached on disk and reused.
+    """
+
+    name = "onnx"
+    tensor_type = "np"
+
+    def __init__(self, model, model_name: str, quantize: bool = False,
+                 export_dir: Optional[str] = None, num_threads: Optional[int] = None):
+        try:
+            import onnxruntime as ort
+        except ImportError:
+            raise ImportError("The ONNX backend requires onnxruntime (pip install onnxruntime)")
+
+        export_dir = export_dir or os.getenv("SENTIMENT_ONNX_DIR", os.path.join(".cache", "onnx"))
+        os.makedirs(export_dir, exist_ok=True)
+
+        base_path = os.path.join(export_dir, model_name.replace("/", "__") + ".onnx")
+        if not os.path.exists(base_path):
+            self._export(model, base_path)
+
+        model_path = base_path
+        if quantize:
+            model_path = base_path.replace(".onnx", "-int8.onnx")
+            if not os.path.exists(model_path):
+                from onnxruntime.quantization import QuantType, quantize_dynamic
+                print(f"[INFO] Quantizing {base_path} to int8")
+                quantize_dynamic(base_path, model_path, weight_type=QuantType.QInt8)
+
+        options = ort.SessionOptions()
+        if num_threads:
+            options.intra_op_num_threads = num_threads
+        self.session = ort.InferenceSession(model_path, options, providers=["CPUExecutionProvider"])
+        self.input_names = [i.name for i in self.session.get_inputs()]
+        self.quantized = quantize
+        self.name = "onnx-int8" if quantize else "onnx"
+        print(f"[INFO] Loaded ONNX model from {model_path}")
+
+    @staticmethod
+    def _export(model, path: str):
+        print(f"[INFO] Exporting model to ONNX at {path}")
+        wrapper = _LogitsOnly(model.to("cpu")).eval()
+        dummy = torch.ones((1, 8), dtype=torch.long)
+        torch.onnx.export(
+            wrapper,
+            (dummy, dummy),
+            path,
+            input_names=["input_ids", "attention_mask"],
+            output_names=["logits"],
+            dynamic_axes={
+                "input_ids": {0: "batch", 1: "sequence"},
+                "attention_mask": {0: "batch", 1: "sequence"},
+                "logits": {0: "batch"}
+            },
+            opset_version=14
+        )
+
+    def predict_proba(self, inputs) -> np.ndarray:
+        feed = {name: np.asarray(inputs[name], dtype=np.int64) for name in self.input_names}
+        logits = self.session.run(["logits"], feed)[0]
+        return _softmax(logits)
+
+
+def create_backend(name: str, model, model_name: str, device):
+    """Build an inference backend by name: 'torch', 'onnx' or 'onnx-int8'."""
+    name = (name or "torch").lower()
+    if name == "torch":
+        return TorchBackend(model, device)
+    if name in ("onnx", "onnx-int8"):
+        if device.type != "cpu":
+            print(f"[WARNING] ONNX backend runs on CPU; ignoring device {device}")
+        return OnnxBackend(model, model_name, quantize=name == "onnx-int8")
+    raise ValueError(f"Unknown inference backend: {name}. Must be 'torch', 'onnx' or 'onnx-int8'")
+
+
+def compare_backends(tokenizer, reference, candidate, texts: List[str],
+                     max_length: int = 128, batch_size: int = 32, repeats: int = 3) -> Dict[str, Any]:
+    """
+    Accuracy-parity and latency check of `candidate` against `reference`
+    (normally TorchBackend) on the same texts and batch shapes.
+    """
+    if not texts:
+        raise ValueError("compare_backends needs at least one text")
+
+    def run(backend):
+        probs = []
+        start = time.perf_counter()
+        for _ in range(repeats):
+            probs = []
+            for i in range(0, len(texts), batch_size):
+                inputs = tokenizer(texts[i:i + batch_size], truncation=True, max_length=max_length,
+                                   padding=True, return_tensors=backend.tensor_type)
+                probs.append(backend.predict_proba(inputs))
+        elapsed = (time.perf_counter() - start) / repeats
+        return np.concatenate(probs), elapsed
+
+    ref_probs, ref_time = run(reference)
+    cand_probs, cand_time = run(candidate)
+
+    report = {
+        "texts": len(texts),
+        "label_agreement": float((ref_probs.argmax(axis=1) == cand_probs.argmax(axis=1)).mean()),
+        "max_abs_prob_diff": float(np.abs(ref_probs - cand_probs).max()),
+        "reference": {"backend": reference.name, "seconds": round(ref_time, 4),
+                      "ms_per_text": round(ref_time / len(texts) * 1000, 3)},
+        "candidate": {"backend": candidate.name, "seconds": round(cand_time, 4),
+                      "ms_per_text": round(cand_time / len(texts) * 1000, 3)},
+        "speedup": round(ref_time / cand_time, 2) if cand_time else None
+    }
+
+    print(f"[INFO] {candidate.name} vs {reference.name}: "
+          f"{report['label_agreement']:.2%} label agreement, "
+          f"max prob diff {report['max_abs_prob_diff']:.4f}, {report['speedup']}x speedup")
+    return report
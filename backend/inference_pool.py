@@ -0,0 +1,282 @@
+# backend/inference_pool.py
+
+import itertools
+import multiprocessing as mp
+import os
+import queue
+import threading
+import time
+from concurrent.futures import Future, TimeoutError
+from typing import Any, Dict, List, Optional
+
+# Analyzer inherited by forked workers so they share the parent's weights copy-on-write
+_shared_analyzer = None
+
+
+def _available_cores() -> List[int]:
+    if hasattr(os, "sched_getaffinity"):
+        return sorted(os.sched_getaffinity(0))
+    return list(range(os.cpu_count() or 1))
+
+
+def _answer_pings(worker_id, control_queue, result_queue):
+    """Worker thread: answer health probes sent to this worker only, even while it is scoring."""
+    while True:
+        sent_at = control_queue.get()
+        if sent_at is None:
+            break
+        result_queue.put(("pong", worker_id, sent_at, None))
+
+
+def _worker_main(worker_id, cores, analyzer_kwargs, task_queue, control_queue, result_queue, current_tasks):
+    """Worker process: pin to a core slice, load (or inherit) the model, serve micro-batches."""
+    try:
+        if cores and hasattr(os, "sched_setaffinity"):
+            os.sched_setaffinity(0, cores)
+
+        import torch
+        torch.set_num_threads(max(1, len(cores)))
+
+        analyzer = _shared_analyzer
+        if analyzer is None:
+            from backend.sentiment_analysis import RobertaSentimentAnalyzer
+            analyzer = RobertaSentimentAnalyzer(**analyzer_kwargs, device="cpu", cache=False, num_workers=0)
+    except Exception as e:
+        result_queue.put(("failed", worker_id, None, repr(e)))
+        return
+
+    result_queue.put(("ready", worker_id, None, os.getpid()))
+    threading.Thread(target=_answer_pings, args=(worker_id, control_queue, result_queue), daemon=True).start()
+
+    while True:
+        task = task_queue.get()
+        if task is None:
+            break
+
+        task_id, texts = task
+        # Shared memory rather than the queue, so the claim survives a hard crash
+        current_tasks[worker_id] = task_id
+        try:
+            result_queue.put(("done", worker_id, task_id, analyzer._predict_batch(texts)))
+        except Exception as e:
+            result_queue.put(("error", worker_id, task_id, repr(e)))
+        current_tasks[worker_id] = -1
+
+
+class InferenceWorkerPool:
+    """
+    Pool of inference processes, each pinned to its own slice of cores with a
+    matching torch thread count. Micro-batches go over a shared task queue and
+    results come back as futures; workers that die after starting are
+    restarted, while ones that never get ready are marked failed. predict()
+    gives up after `task_timeout` seconds (SENTIMENT_WORKER_TIMEOUT).
+    """
+
+    def __init__(self, num_workers: Optional[int] = None, analyzer_kwargs: Optional[Dict[str, Any]] = None,
+                 chunk_size: int = 64, start_method: Optional[str] = None, shared_analyzer=None,
+                 health_interval: float = 5.0, task_timeout: Optional[float] = None):
+        cores = _available_cores()
+        self.num_workers = num_workers or max(1, len(cores) // 4)
+        if self.num_workers <= 0:
+            raise ValueError("num_workers must be a positive integer")
+        if chunk_size <= 0:
+            raise ValueError("chunk_size must be a positive integer")
+
+        self.analyzer_kwargs = analyzer_kwargs or {}
+        self.chunk_size = chunk_size
+        self.health_interval = health_interval
+        self.task_timeout = float(task_timeout or os.getenv("SENTIMENT_WORKER_TIMEOUT", 300))
+        if self.task_timeout <= 0:
+            raise ValueError("task_timeout must be a positive number of seconds")
+
+        # Split the available cores into one contiguous slice per worker
+        per_worker = max(1, len(cores) // self.num_workers)
+        self.core_slices = [
+            cores[(i * per_worker) % len(cores):(i * per_worker) % len(cores) + per_worker]
+            for i in range(self.num_workers)
+        ]
+
+        start_method = start_method or os.getenv("SENTIMENT_WORKER_START", "spawn")
+        self._ctx = mp.get_context(start_method)
+        if shared_analyzer is not None and start_method == "fork":
+            global _shared_analyzer
+            _shared_analyzer = shared_analyzer
+
+        self._task_queue = self._ctx.Queue()
+        self._result_queue = self._ctx.Queue()
+        self._task_ids = itertools.count()
+        self._pending = {}    # task_id -> Future
+        # Task id each worker is currently running (-1 when idle)
+        self._current_tasks = self._ctx.Array("q", [-1] * self.num_workers, lock=False)
+        self._lock = threading.Lock()
+        self._stopping = False
+        self._closed = False
+
+        self._workers = {}
+        self._control_queues = {}    # worker_id -> queue of health probes for that worker
+        self._status = {}
+        for worker_id in range(self.num_workers):
+            self._start_worker(worker_id)
+
+        self._collector = threading.Thread(target=self._collect_results, daemon=True)
+        self._collector.start()
+        print(f"[INFO] Started {self.num_workers} inference workers ({per_worker} cores each, {start_method})")
+
+    def _start_worker(self, worker_id: int):
+        # A fresh control queue per process, so probes never reach a replacement late
+        control_queue = self._ctx.Queue()
+        process = self._ctx.Process(
+            target=_worker_main,
+            args=(worker_id, self.core_slices[worker_id], self.analyzer_kwargs,
+                  self._task_queue, control_queue, self._result_queue, self._current_tasks),
+            daemon=True
+        )
+        process.start()
+        self._workers[worker_id] = process
+        self._control_queues[worker_id] = control_queue
+        self._status[worker_id] = {"state": "starting", "restarts": self._status.get(worker_id, {}).get("restarts", 0)}
+
+    def _collect_results(self):
+        while not self._closed:
+            try:
+                kind, worker_id, task_id, payload = self._result_queue.get(timeout=self.health_interval)
+            except queue.Empty:
+                self._check_workers()
+                continue
+            except (EOFError, OSError):
+                break
+
+            with self._lock:
+                if kind == "ready":
+                    self._status[worker_id].update(state="ready", pid=payload)
+                elif kind == "failed":
+                    self._status[worker_id].update(state="failed", error=payload)
+                    self._fail_pending_if_all_failed()
+                elif kind == "pong":
+                    # `task_id` carries the time the probe was sent
+                    now = time.time()
+                    self._status[worker_id].update(last_pong=now, ping_ms=round((now - task_id) * 1000, 1))
+                else:
+                    future = self._pending.pop(task_id, None)
+                    if future is not None:
+                        if kind == "done":
+                            future.set_result(payload)
+                        else:
+                            future.set_exception(RuntimeError(f"Inference worker {worker_id} failed: {payload}"))
+
+            self._check_workers()
+
+    def _fail_pending_if_all_failed(self):
+        """With no worker left that could start, fail every waiting task (caller holds the lock)."""
+        if not all(status["state"] == "failed" for status in self._status.values()):
+            return
+        for future in self._pending.values():
+            future.set_exception(RuntimeError("All inference workers failed to start"))
+        self._pending.clear()
+
+    def _check_workers(self):
+        """Fail tasks held by dead workers and start replacements."""
+        if self._stopping:
+            return
+        with self._lock:
+            for worker_id, process in list(self._workers.items()):
+                status = self._status[worker_id]
+                if process.is_alive() or status["state"] == "failed":
+                    continue
+
+                if status["state"] == "starting":
+                    # Died while loading (e.g. an import error); a restart would fail the same way
+                    print(f"[WARNING] Inference worker {worker_id} exited with code {process.exitcode} before becoming ready")
+                    status.update(state="failed", error=f"exited with code {process.exitcode} before becoming ready")
+                    self._fail_pending_if_all_failed()
+                    continue
+
+                print(f"[WARNING] Inference worker {worker_id} exited with code {process.exitcode}; restarting")
+                task_id = self._current_tasks[worker_id]
+                self._current_tasks[worker_id] = -1
+                future = self._pending.pop(task_id, None)
+                if future is not None:
+                    future.set_exception(RuntimeError(f"Inference worker {worker_id} died"))
+
+                status["restarts"] += 1
+                self._start_worker(worker_id)
+
+    def submit(self, texts: List[str]) -> Future:
+        """Queue one micro-batch of texts; the future resolves to their sentiment results."""
+        if self._stopping:
+            raise RuntimeError("Inference worker pool is shut down")
+        if all(status["state"] == "failed" for status in self._status.values()):
+            raise RuntimeError("All inference workers failed to start")
+        future = Future()
+        task_id = next(self._task_ids)
+        with self._lock:
+            self._pending[task_id] = future
+        self._task_queue.put((task_id, list(texts)))
+        return future
+
+    def predict(self, texts: List[str], timeout: Optional[float] = None) -> List[Dict[str, Any]]:
+        """Split texts into micro-batches across the workers and return results in order."""
+        timeout = self.task_timeout if timeout is None else timeout
+        deadline = time.monotonic() + timeout
+        futures = [self.submit(texts[i:i + self.chunk_size]) for i in range(0, len(texts), self.chunk_size)]
+        results = []
+        try:
+            for future in futures:
+                results.extend(future.result(timeout=max(0.0, deadline - time.monotonic())))
+        except TimeoutError:
+            with self._lock:
+                self._pending = {task_id: pending for task_id, pending in self._pending.items()
+                                 if pending not in futures}
+            raise TimeoutError(f"Inference workers did not answer within {timeout}s")
+        return results
+
+    def health_check(self) -> List[Dict[str, Any]]:
+        """
+        Report liveness of every worker and send each live one a ping on its own
+        control queue; the answer shows up as last_pong/ping_ms in later reports.
+        """
+        self._check_workers()
+        report = []
+        with self._lock:
+            for worker_id, process in self._workers.items():
+                status = self._status[worker_id]
+                report.append({
+                    "worker_id": worker_id,
+                    "pid": process.pid,
+                    "alive": process.is_alive(),
+                    "state": status["state"],
+                    "restarts": status["restarts"],
+                    "cores": self.core_slices[worker_id],
+                    "busy": self._current_tasks[worker_id] != -1,
+                    "last_pong": status.get("last_pong"),
+                    "ping_ms": status.get("ping_ms"),
+                    "error": status.get("error")
+                })
+                if process.is_alive() and status["state"] == "ready":
+                    self._control_queues[worker_id].put(time.time())
+        return report
+
+    def shutdown(self, timeout: float = 10.0):
+        """Stop workers after queued batches finish; anything left unresolved is failed."""
+        if self._stopping:
+            return
+        self._stopping = True
+        for worker_id in self._workers:
+            self._task_queue.put(None)
+            self._control_queues[worker_id].put(None)
+        for process in self._workers.values():
+            process.join(timeout)
+            if process.is_alive():
+                process.terminate()
+
+        # Give the collector a moment to drain results of batches that finished
+        deadline = time.time() + timeout
+        while self._pending and time.time() < deadline and self._collector.is_alive():
+            time.sleep(0.05)
+
+        self._closed = True
+        with self._lock:
+            for future in self._pending.values():
+                future.set_exception(RuntimeError("Inference worker pool shut down"))
+            self._pending.clear()
+        print("[INFO] Inference worker pool shut down")
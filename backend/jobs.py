@@ -0,0 +1,173 @@
+# backend/jobs.py
+
+import logging
+import os
+import threading
+import time
+import traceback
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Dict, Optional
+
+from backend.progress import ProgressTracker
+
+logger = logging.getLogger(__name__)
+
+
+class JobCancelled(Exception):
+    """Raised inside a job function once cancellation has been requested."""
+
+
+class JobQueueFull(Exception):
+    """Raised by JobManager.submit when too many jobs are already waiting."""
+
+
+class Job:
+    """State, progress and result of one background job."""
+
+    def __init__(self, kind: str):
+        self.id = uuid.uuid4().hex
+        self.kind = kind
+        self.state = "queued"
+        self.tracker = ProgressTracker()
+        self.result = None
+        self.error: Optional[str] = None
+        self.created_at = time.time()
+        self.started_at: Optional[float] = None
+        self.finished_at: Optional[float] = None
+        self.future = None
+        self._cancel_requested = threading.Event()
+
+    @property
+    def finished(self) -> bool:
+        return self.state in ("succeeded", "failed", "cancelled")
+
+    @property
+    def cancel_requested(self) -> bool:
+        return self._cancel_requested.is_set()
+
+    def check_cancelled(self):
+        """Call between units of work; stops the job if it was cancelled."""
+        if self._cancel_requested.is_set():
+            raise JobCancelled(self.id)
+
+    def update_progress(self, force: bool = False, **fields):
+        """Record progress; listeners see it at the tracker's throttled rate unless forced."""
+        self.tracker.update(force=force, **fields)
+
+    def to_dict(self, include_result: bool = True) -> Dict[str, Any]:
+        status = {
+            "job_id": self.id,
+            "kind": self.kind,
+            "state": self.state,
+            "cancel_requested": self.cancel_requested,
+            "progress": self.tracker.snapshot(),
+            "error": self.error,
+            "created_at": self.created_at,
+            "started_at": self.started_at,
+            "finished_at": self.finished_at
+        }
+        if include_result and self.state == "succeeded":
+            status["result"] = self.result
+        return status
+
+
+class JobManager:
+    """
+    Run long analyses on a bounded thread pool and keep their status and
+    results around for `ttl` seconds after they finish. Job functions take
+    the Job as their first argument to report progress and honour cancellation.
+    """
+
+    def __init__(self, max_workers: Optional[int] = None, ttl: Optional[float] = None,
+                 max_pending: Optional[int] = None):
+        self.max_workers = int(max_workers or os.getenv("JOB_WORKERS", 2))
+        self.ttl = float(ttl or os.getenv("JOB_RESULT_TTL", 3600))
+        self.max_pending = int(max_pending or os.getenv("JOB_MAX_PENDING", 100))
+        if self.max_workers <= 0:
+            raise ValueError("max_workers must be a positive integer")
+        if self.ttl <= 0:
+            raise ValueError("ttl must be a positive number of seconds")
+
+        self._executor = ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix="job")
+        self._jobs: Dict[str, Job] = {}
+        self._lock = threading.Lock()
+
+    def submit(self, kind: str, func: Callable[..., Any], *args, **kwargs) -> Job:
+        self.purge_expired()
+        with self._lock:
+            pending = sum(1 for job in self._jobs.values() if job.state == "queued")
+            if pending >= self.max_pending:
+                raise JobQueueFull(f"{pending} jobs are already waiting")
+            job = Job(kind)
+            self._jobs[job.id] = job
+        job.future = self._executor.submit(self._run, job, func, args, kwargs)
+        logger.info(f"Queued {kind} job {job.id}")
+        return job
+
+    def _run(self, job: Job, func, args, kwargs):
+        if job.cancel_requested:
+            self._finish(job, "cancelled")
+            return
+        job.state = "running"
+        job.started_at = time.time()
+        job.tracker.publish()
+        try:
+            job.result = func(job, *args, **kwargs)
+            self._finish(job, "succeeded")
+        except JobCancelled:
+            self._finish(job, "cancelled")
+        except Exception as e:
+            job.error = str(e)
+            logger.error(f"Job {job.id} failed: {traceback.format_exc()}")
+            self._finish(job, "failed")
+
+    @staticmethod
+    def _finish(job: Job, state: str):
+        job.state = state
+        job.finished_at = time.time()
+        job.tracker.publish()
+        duration = job.finished_at - (job.started_at or job.created_at)
+        logger.info(f"Job {job.id} {state} after {duration:.2f}s")
+
+    def get(self, job_id: str) -> Optional[Job]:
+        self.purge_expired()
+        with self._lock:
+            return self._jobs.get(job_id)
+
+    def cancel(self, job_id: str) -> Optional[Job]:
+        """Request cancellation; queued jobs never start, running ones stop at their next check."""
+        job = self.get(job_id)
+        if job is None or job.finished:
+            return job
+        job._cancel_requested.set()
+        if job.future is not None and job.future.cancel():
+            self._finish(job, "cancelled")
+        return job
+
+    def purge_expired(self) -> int:
+        """Forget finished jobs whose results are older than the TTL."""
+        cutoff = time.time() - self.ttl
+        with self._lock:
+            expired = [job_id for job_id, job in self._jobs.items()
+                       if job.finished and job.finished_at < cutoff]
+            for job_id in expired:
+                del self._jobs[job_id]
+        return len(expired)
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            states = {}
+            for job in self._jobs.values():
+                states[job.state] = states.get(job.state, 0) + 1
+        return {"max_workers": self.max_workers, "ttl": self.ttl, "max_pending": self.max_pending, "jobs": states}
+
+    def shutdown(self, wait: bool = True):
+        with self._lock:
+            jobs = list(self._jobs.values())
+        for job in jobs:
+            if not job.finished:
+                job._cancel_requested.set()
+                if job.future is not None and job.future.cancel():
+                    self._finish(job, "cancelled")
+        self._executor.shutdown(wait=wait)
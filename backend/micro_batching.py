@@ -0,0 +1,152 @@
+# backend/micro_batching.py
+
+import bisect
+import os
+import queue
+import threading
+import time
+from concurrent.futures import Future
+from typing import Any, Dict, List, Optional
+
+
+class Histogram:
+    """Fixed-bucket histogram; each bucket counts values <= its upper bound."""
+
+    def __init__(self, bounds: List[float]):
+        self.bounds = sorted(bounds)
+        self.counts = [0] * (len(self.bounds) + 1)
+        self.total = 0
+        self.sum = 0.0
+        self._lock = threading.Lock()
+
+    def observe(self, value: float):
+        with self._lock:
+            self.counts[bisect.bisect_left(self.bounds, value)] += 1
+            self.total += 1
+            self.sum += value
+
+    def snapshot(self) -> Dict[str, Any]:
+        with self._lock:
+            buckets = {f"<={bound:g}": count for bound, count in zip(self.bounds, self.counts)}
+            buckets["+inf"] = self.counts[-1]
+            return {
+                "count": self.total,
+                "mean": round(self.sum / self.total, 3) if self.total else 0.0,
+                "buckets": buckets
+            }
+
+
+class MicroBatcher:
+    """
+    Central queue in front of a sentiment analyzer. Texts from concurrent
+    callers are collected for up to `window_ms` (or until `max_batch_size`
+    texts are waiting), scored in one predict_texts() call, and handed back
+    to each caller through its own future.
+    """
+
+    def __init__(self, analyzer, window_ms: Optional[float] = None, max_batch_size: Optional[int] = None):
+        self.analyzer = analyzer
+        self.window = float(window_ms if window_ms is not None else os.getenv("SENTIMENT_BATCH_WINDOW_MS", 10)) / 1000
+        self.max_batch_size = int(max_batch_size or os.getenv("SENTIMENT_BATCH_MAX_TEXTS", 256))
+        if self.window < 0:
+            raise ValueError("window_ms must not be negative")
+        if self.max_batch_size <= 0:
+            raise ValueError("max_batch_size must be a positive integer")
+
+        self.batch_sizes = Histogram([1, 2, 4, 8, 16, 32, 64, 128, 256, 512, 1024])
+        self.requests_per_batch = Histogram([1, 2, 4, 8, 16, 32])
+        self.queue_wait_ms = Histogram([1, 2, 5, 10, 20, 50, 100, 250, 500, 1000])
+        self.latency_ms = Histogram([5, 10, 25, 50, 100, 250, 500, 1000, 2500, 5000, 10000])
+
+        self._queue = queue.Queue()
+        self._closed = False
+        self._thread = threading.Thread(target=self._run, name="sentiment-micro-batcher", daemon=True)
+        self._thread.start()
+
+    def submit(self, texts: List[str]) -> Future:
+        """Queue texts for the next batch; the future resolves to their results in order."""
+        if self._closed:
+            raise RuntimeError("MicroBatcher is closed")
+        future = Future()
+        if not texts:
+            future.set_result([])
+            return future
+        self._queue.put((list(texts), future, time.perf_counter()))
+        return future
+
+    def predict_texts(self, texts: List[str]) -> List[Dict[str, Any]]:
+        return self.submit(texts).result()
+
+    def analyze_social_media_data(self, data, records=False):
+        return self.analyzer.analyze_social_media_data(data, predict=self.predict_texts, records=records)
+
+    def _collect(self):
+        """Block for the first request, then gather more until the window closes or the batch is full."""
+        first = self._queue.get()
+        if first is None:
+            return None
+
+        requests = [first]
+        size = len(first[0])
+        deadline = time.perf_counter() + self.window
+
+        while size < self.max_batch_size:
+            remaining = deadline - time.perf_counter()
+            if remaining <= 0:
+                break
+            try:
+                request = self._queue.get(timeout=remaining)
+            except queue.Empty:
+                break
+            if request is None:
+                self._queue.put(None)  # Finish this batch, then stop
+                break
+            requests.append(request)
+            size += len(request[0])
+
+        return requests
+
+    def _run(self):
+        while True:
+            requests = self._collect()
+            if requests is None:
+                break
+
+            texts = [text for request_texts, _, _ in requests for text in request_texts]
+            started = time.perf_counter()
+            self.batch_sizes.observe(len(texts))
+            self.requests_per_batch.observe(len(requests))
+            for _, _, queued_at in requests:
+                self.queue_wait_ms.observe((started - queued_at) * 1000)
+
+            try:
+                results = self.analyzer.predict_texts(texts)
+            except Exception as e:
+                for _, future, _ in requests:
+                    future.set_exception(e)
+                continue
+
+            offset = 0
+            finished = time.perf_counter()
+            for request_texts, future, queued_at in requests:
+                future.set_result(results[offset:offset + len(request_texts)])
+                offset += len(request_texts)
+                self.latency_ms.observe((finished - queued_at) * 1000)
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "window_ms": self.window * 1000,
+            "max_batch_size": self.max_batch_size,
+            "queued_requests": self._queue.qsize(),
+            "batch_size": self.batch_sizes.snapshot(),
+            "requests_per_batch": self.requests_per_batch.snapshot(),
+            "queue_wait_ms": self.queue_wait_ms.snapshot(),
+            "latency_ms": self.latency_ms.snapshot()
+        }
+
+    def close(self):
+        """Stop accepting work and let already queued requests finish."""
+        if not self._closed:
+            self._closed = True
+            self._queue.put(None)
+            self._thread.join()
@@ -0,0 +1,75 @@
+# backend/pipeline.py
+
+import queue
+import threading
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional
+
+_DONE = object()
+
+
+class _Failure:
+    def __init__(self, error: BaseException):
+        self.error = error
+
+
+def prefetch(iterable: Iterable[Any], depth: int = 2) -> Iterator[Any]:
+    """
+    Iterate `iterable` in a background thread, keeping up to `depth` items
+    ready, so slow producers (e.g. collector API pages) overlap with the
+    consumer's work. Producer exceptions are re-raised in the consumer.
+    """
+    if depth <= 0:
+        raise ValueError("depth must be a positive integer")
+
+    buffer = queue.Queue(maxsize=depth)
+    stop = threading.Event()
+
+    def put(item) -> bool:
+        while not stop.is_set():
+            try:
+                buffer.put(item, timeout=0.1)
+                return True
+            except queue.Full:
+                continue
+        return False
+
+    def produce():
+        try:
+            for item in iterable:
+                if not put(item):
+                    return
+            put(_DONE)
+        except BaseException as e:
+            put(_Failure(e))
+
+    producer = threading.Thread(target=produce, name="prefetch", daemon=True)
+    producer.start()
+    try:
+        while True:
+            item = buffer.get()
+            if item is _DONE:
+                break
+            if isinstance(item, _Failure):
+                raise item.error
+            yield item
+    finally:
+        # Consumer stopped early or finished: let a blocked producer exit
+        stop.set()
+
+
+def stream_analysis(data: Iterable[Dict[str, Any]], preprocessor, analyzer,
+                    aggregator=None, chunk_size: int = 500,
+                    predict: Optional[Callable] = None, records: bool = False) -> Iterator[List[Any]]:
+    """
+    Stream raw items through preprocess -> sentiment -> aggregation in bounded
+    chunks. Yields each chunk of sentiment results as soon as it is scored and
+    folds it into `aggregator` (e.g. TrendAnalyzer.analysis_summary()), so at
+    most one chunk of items is materialized at a time. records=True passes
+    SocialMediaRecord/SentimentRecord objects between the stages instead of dicts.
+    """
+    processed = preprocessor.iter_preprocess_social_media_data(data, records=records)
+    for results in analyzer.iter_analyze_social_media_data(processed, chunk_size=chunk_size,
+                                                           predict=predict, records=records):
+        if aggregator is not None:
+            aggregator.update(results)
+        yield results
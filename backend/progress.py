@@ -0,0 +1,68 @@
+# backend/progress.py
+
+import os
+import threading
+import time
+from typing import Any, Dict, Optional, Tuple
+
+
+class ProgressTracker:
+    """
+    Latest progress fields of a running analysis, published to waiting
+    listeners (e.g. an SSE stream) at most `max_rate` times per second.
+    Updates in between are merged, and the newest values are still
+    delivered once the interval has passed.
+    """
+
+    def __init__(self, max_rate: Optional[float] = None):
+        max_rate = float(max_rate or os.getenv("PROGRESS_MAX_RATE", 4))
+        if max_rate <= 0:
+            raise ValueError("max_rate must be a positive number of updates per second")
+        self.min_interval = 1.0 / max_rate
+        self.version = 0
+        self._fields: Dict[str, Any] = {}
+        self._dirty = False
+        self._published_at = 0.0
+        self._condition = threading.Condition()
+
+    def _publish(self):
+        self.version += 1
+        self._dirty = False
+        self._published_at = time.monotonic()
+        self._condition.notify_all()
+
+    def update(self, force: bool = False, **fields):
+        """Merge fields; listeners are woken now only if forced or the interval has passed."""
+        with self._condition:
+            self._fields.update(fields)
+            self._dirty = True
+            if force or time.monotonic() - self._published_at >= self.min_interval:
+                self._publish()
+
+    def publish(self):
+        """Wake listeners immediately, e.g. when the job finishes."""
+        with self._condition:
+            self._publish()
+
+    def snapshot(self) -> Dict[str, Any]:
+        with self._condition:
+            return dict(self._fields)
+
+    def wait(self, last_version: int, timeout: float) -> Tuple[int, Optional[Dict[str, Any]]]:
+        """Block until there is a version newer than last_version; (version, None) on timeout."""
+        deadline = time.monotonic() + timeout
+        with self._condition:
+            while True:
+                now = time.monotonic()
+                if self._dirty and now - self._published_at >= self.min_interval:
+                    self._publish()
+                if self.version > last_version:
+                    return self.version, dict(self._fields)
+
+                remaining = deadline - now
+                if remaining <= 0:
+                    return self.version, None
+                if self._dirty:
+                    # Come back when the throttled update may be published
+                    remaining = min(remaining, self._published_at + self.min_interval - now)
+                self._condition.wait(remaining)
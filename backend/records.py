@@ -0,0 +1,87 @@
+# backend/records.py
+
+from collections.abc import Mapping
+from typing import Any, Dict, Iterator, List, Optional
+
+
+class _Record(Mapping):
+    """
+    Compact read-only view shared by the pipeline records: attributes live in
+    __slots__ instead of a per-item dict, while get()/[]/in still work for
+    code written against the JSON dicts (TrendAnalyzer, db_utils).
+    """
+
+    __slots__ = ()
+    _keys = ()
+
+    def __getitem__(self, key):
+        if key in self._keys:
+            return getattr(self, key)
+        raise KeyError(key)
+
+    def get(self, key, default=None):
+        return getattr(self, key) if key in self._keys else default
+
+    def __contains__(self, key):
+        return key in self._keys
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._keys)
+
+    def __len__(self) -> int:
+        return len(self._keys)
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {key: getattr(self, key) for key in self._keys}
+
+    def __repr__(self):
+        return f"{type(self).__name__}({self.to_dict()!r})"
+
+
+class SocialMediaRecord(_Record):
+    """A preprocessed post: only the fields sentiment scoring needs."""
+
+    __slots__ = ('platform', 'id', 'username', 'timestamp', 'original_text',
+                 'cleaned_text', 'hashtags', 'likes', 'shares')
+    _keys = __slots__
+
+    def __init__(self, platform: Optional[str] = None, id=None, username: Optional[str] = None,
+                 timestamp=None, original_text: Optional[str] = None, cleaned_text: Optional[str] = None,
+                 hashtags: Optional[List[str]] = None, likes=None, shares=None):
+        self.platform = platform
+        self.id = id
+        self.username = username
+        self.timestamp = timestamp
+        self.original_text = original_text
+        self.cleaned_text = cleaned_text
+        self.hashtags = hashtags if hashtags is not None else []
+        self.likes = likes
+        self.shares = shares
+
+
+class SentimentRecord(_Record):
+    """A scored post; to_dict() gives the JSON shape returned by /analyze."""
+
+    __slots__ = ('id', 'platform', 'text', 'username', 'timestamp', 'sentiment',
+                 'sentiment_score', 'hashtags', 'likes', 'shares')
+    _keys = ('id', 'platform', 'text', 'username', 'timestamp', 'sentiment',
+             'sentiment_score', 'hashtags', 'metrics')
+
+    def __init__(self, id=None, platform: Optional[str] = None, text: str = "",
+                 username: Optional[str] = None, timestamp=None, sentiment: str = "Neutral",
+                 sentiment_score: float = 0.0, hashtags: Optional[List[str]] = None,
+                 likes=None, shares=None):
+        self.id = id
+        self.platform = platform
+        self.text = text
+        self.username = username
+        self.timestamp = timestamp
+        self.sentiment = sentiment
+        self.sentiment_score = sentiment_score
+        self.hashtags = hashtags if hashtags is not None else []
+        self.likes = likes
+        self.shares = shares
+
+    @property
+    def metrics(self) -> Dict[str, Any]:
+        return {"likes": self.likes, "shares": self.shares}
@@ -1,22 +1,104 @@
 import json
+import re
 import time
 import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
 from typing import List, Dict, Any, Union, Optional
 import requests
+from requests.adapters import HTTPAdapter
 from transformers import AutoModelForSequenceClassification, AutoTokenizer
 import torch
-from concurrent.futures import ThreadPoolExecutor
 import numpy as np
+from backend.cache import SentimentResultCache
+from backend.records import SentimentRecord, SocialMediaRecord
+from backend.inference_backends import TorchBackend, compare_backends, create_backend
+from backend.inference_pool import InferenceWorkerPool
+
+class TokenBudgetScheduler:
+    """Group texts of similar token length into batches under a padded-token budget."""
+
+    def __init__(self, max_tokens: int = 4096, max_batch_size: Optional[int] = None):
+        if max_tokens <= 0:
+            raise ValueError("max_tokens must be a positive integer")
+        self.max_tokens = max_tokens
+        self.max_batch_size = max_batch_size
+
+    def schedule(self, lengths: List[int]) -> List[List[int]]:
+        """
+        Return batches of indices into `lengths`, shortest texts first.
+        Each batch pads to its longest member, so `len(batch) * longest`
+        stays within the token budget (a single over-budget text runs alone).
+        """
+        order = sorted(range(len(lengths)), key=lambda i: lengths[i])
+        batches = []
+        batch = []
+
+        for i in order:
+            # Sorted ascending, so the new text is always the longest in the batch
+            padded_tokens = (len(batch) + 1) * lengths[i]
+            batch_full = self.max_batch_size is not None and len(batch) >= self.max_batch_size
+            if batch and (padded_tokens > self.max_tokens or batch_full):
+                batches.append(batch)
+                batch = []
+            batch.append(i)
+
+        if batch:
+            batches.append(batch)
+
+        return batches
+
+    @staticmethod
+    def padding_stats(lengths: List[int], batches: List[List[int]]) -> Dict[str, Any]:
+        """Summarize how much of the scheduled work is real tokens vs padding."""
+        real_tokens = sum(lengths)
+        padded_tokens = sum(len(batch) * max(lengths[i] for i in batch) for batch in batches)
+
+        return {
+            "texts": len(lengths),
+            "batches": len(batches),
+            "real_tokens": real_tokens,
+            "padded_tokens": padded_tokens,
+            "padding_efficiency": round(real_tokens / padded_tokens, 4) if padded_tokens else 1.0
+        }
 
 class RobertaSentimentAnalyzer:
     """Sentiment analyzer using RoBERTa model."""
 
-    def __init__(self, model_name="cardiffnlp/twitter-roberta-base-sentiment", device=None):
-        """Initialize RoBERTa sentiment analyzer."""
+    def __init__(self, model_name="cardiffnlp/twitter-roberta-base-sentiment", device=None, batch_size=None,
+                 max_length=None, max_batch_tokens=None, cache=None, backend=None, num_workers=None):
+        """
+        Initialize RoBERTa sentiment analyzer.
+        `cache` may be a SentimentResultCache, False to disable caching, or None
+        to build one from SENTIMENT_CACHE_SIZE / _TTL / _PATH.
+        `backend` selects the inference runtime ('torch', 'onnx' or 'onnx-int8',
+        default from SENTIMENT_BACKEND).
+        `num_workers` > 0 (or SENTIMENT_WORKERS) moves CPU inference into a pool of
+        worker processes pinned to separate cores; call close() to stop them.
+        """
         try:
+            self.model_name = model_name
+            # Upper bound on texts sent through the model in one forward pass
+            self.batch_size = int(batch_size or os.getenv("SENTIMENT_BATCH_SIZE", 32))
+            if self.batch_size <= 0:
+                raise ValueError("batch_size must be a positive integer")
+
             self.tokenizer = AutoTokenizer.from_pretrained(model_name)
             self.model = AutoModelForSequenceClassification.from_pretrained(model_name)
 
+            # Truncation cap: tweets rarely need more than 128 tokens, and the
+            # model cannot take more than its position embeddings allow
+            model_limit = self.model.config.max_position_embeddings - 2
+            self.max_length = min(int(max_length or os.getenv("SENTIMENT_MAX_LENGTH", 128)), model_limit)
+
+            # Padded-token budget per forward pass; must fit at least one capped text
+            max_batch_tokens = int(max_batch_tokens or os.getenv("SENTIMENT_MAX_BATCH_TOKENS", 4096))
+            if max_batch_tokens < self.max_length:
+                raise ValueError("max_batch_tokens must be at least max_length")
+            self.scheduler = TokenBudgetScheduler(max_batch_tokens, max_batch_size=self.batch_size)
+            self.last_batch_stats = TokenBudgetScheduler.padding_stats([], [])
+            self.last_dedup_stats = {"texts": 0, "unique_texts": 0, "dedup_ratio": 0.0}
+
             # Force CPU usage
             # self.device = torch.device("cpu")
             # print("[INFO] 🧠 Using CPU (forced)")
@@ -24,8 +106,10 @@ class RobertaSentimentAnalyzer:
             # self.model = self.model.to(self.device)
             # self.model.eval()
             
+            backend = (backend or os.getenv("SENTIMENT_BACKEND", "torch")).lower()
+
             self.device = torch.device(device) if device else (
-                torch.device("cuda") if torch.cuda.is_available() else torch.device("cpu")
+                torch.device("cuda") if torch.cuda.is_available() and backend == "torch" else torch.device("cpu")
             )
 
             if self.device.type == "cuda":
@@ -40,71 +124,363 @@ class RobertaSentimentAnalyzer:
                 
             self.model = self.model.to(self.device)
             self.model.eval()
+            self.inference = create_backend(backend, self.model, model_name, self.device)
 
-            print(f"Initialized RobertaSentimentAnalyzer using {model_name} on {self.device}")
+            print(f"Initialized RobertaSentimentAnalyzer using {model_name} on {self.device} ({self.inference.name} backend)")
             
             # Define sentiment labels
             self.labels = ['Negative', 'Neutral', 'Positive']
+
+            if cache is None:
+                # Quantized/exported runtimes can differ slightly, and so can
+                # results truncated at another length, so cache them apart
+                cache = self._cache_from_env(f"{model_name}@{self.inference.name}/max_length={self.max_length}")
+            self.cache = cache or None
+
+            self.worker_pool = None
+            num_workers = int(num_workers if num_workers is not None else os.getenv("SENTIMENT_WORKERS", 0))
+            if num_workers > 0 and self.device.type == "cpu":
+                self.worker_pool = InferenceWorkerPool(
+                    num_workers,
+                    analyzer_kwargs={
+                        "model_name": model_name,
+                        "batch_size": self.batch_size,
+                        "max_length": self.max_length,
+                        "max_batch_tokens": self.scheduler.max_tokens,
+                        "backend": backend
+                    },
+                    chunk_size=self.batch_size * 2,
+                    shared_analyzer=self
+                )
             
         except Exception as e:
             print(f"Error initializing RoBERTa: {e}")
             raise
     
+    @staticmethod
+    def _cache_from_env(model_name):
+        max_size = int(os.getenv("SENTIMENT_CACHE_SIZE", 10000))
+        if max_size <= 0:
+            return None
+        ttl = os.getenv("SENTIMENT_CACHE_TTL")
+        return SentimentResultCache(
+            model_name,
+            max_size=max_size,
+            ttl=float(ttl) if ttl else None,
+            path=os.getenv("SENTIMENT_CACHE_PATH") or None
+        )
+
     def _predict_sentiment(self, text):
-        if not text or text.isspace():
-            return {"sentiment_score": 0.0, "sentiment_category": "Neutral"}
+        return self.predict_texts([text])[0]
 
-        inputs = self.tokenizer(text, return_tensors="pt", truncation=True, max_length=512, padding=True).to(self.device)
-        with torch.no_grad():
-            outputs = self.model(**inputs)
-            probs = torch.nn.functional.softmax(outputs.logits, dim=1)
-            score, pred = torch.max(probs, dim=1)
+    def predict_texts(self, texts):
+        """
+        Score texts in order. Duplicate texts are scored once and fanned back
+        out, and only unique texts missing from the cache reach the model.
+        """
+        positions = {}
+        unique_texts = []
+        for text in texts:
+            if text not in positions:
+                positions[text] = len(unique_texts)
+                unique_texts.append(text)
 
-        return {
-            "sentiment_score": score.item(),
-            "sentiment_category": self.labels[pred.item()]
+        self.last_dedup_stats = {
+            "texts": len(texts),
+            "unique_texts": len(unique_texts),
+            "dedup_ratio": round(1 - len(unique_texts) / len(texts), 4) if texts else 0.0
         }
 
+        if self.cache is None:
+            unique_results = self._infer(unique_texts)
+        else:
+            unique_results = self.cache.get_many(unique_texts)
+            miss_indices = [i for i, result in enumerate(unique_results) if result is None]
+
+            if miss_indices:
+                miss_texts = [unique_texts[i] for i in miss_indices]
+                predictions = self._infer(miss_texts)
+                self.cache.put_many(miss_texts, predictions)
+                for i, prediction in zip(miss_indices, predictions):
+                    unique_results[i] = prediction
+
+        return [unique_results[positions[text]] for text in texts]
+
+    def _infer(self, texts):
+        """Run the model locally or, when enabled, on the worker process pool."""
+        if self.worker_pool is not None and texts:
+            return self.worker_pool.predict(texts)
+        return self._predict_batch(texts)
+
+    def close(self):
+        """Release background inference resources."""
+        if self.worker_pool is not None:
+            self.worker_pool.shutdown()
+            self.worker_pool = None
+
+    def _predict_batch(self, texts):
+        """Score a list of texts, running one forward pass per length-bucketed micro-batch."""
+        results = [{"sentiment_score": 0.0, "sentiment_category": "Neutral"} for _ in texts]
+
+        # Blank texts never reach the model
+        indices = [i for i, text in enumerate(texts) if text and not text.isspace()]
+        if not indices:
+            self.last_batch_stats = TokenBudgetScheduler.padding_stats([], [])
+            return results
+
+        # Tokenize once without padding so batches can be built from real lengths
+        encodings = self.tokenizer([texts[i] for i in indices], truncation=True, max_length=self.max_length)
+        lengths = [len(ids) for ids in encodings["input_ids"]]
+        batches = self.scheduler.schedule(lengths)
+        self.last_batch_stats = TokenBudgetScheduler.padding_stats(lengths, batches)
+
+        for batch in batches:
+            batch_indices = [indices[j] for j in batch]
+            features = [{key: encodings[key][j] for key in encodings.keys()} for j in batch]
+
+            inputs = self.tokenizer.pad(features, return_tensors=self.inference.tensor_type)
+            probs = self.inference.predict_proba(inputs)
+            scores, preds = probs.max(axis=1), probs.argmax(axis=1)
+
+            for i, score, pred in zip(batch_indices, scores.tolist(), preds.tolist()):
+                results[i] = {
+                    "sentiment_score": score,
+                    "sentiment_category": self.labels[pred]
+                }
+
+        return results
+
+    def warmup(self, shapes=((1, 16), (16, 32), (32, 64))):
+        """
+        Run dummy batches of the given (batch size, token length) shapes so that
+        kernels, allocators and worker processes are primed before real traffic.
+        Bypasses the result cache.
+        """
+        timings = []
+        for batch_size, length in shapes:
+            length = min(length, self.max_length)
+            # Each repeated word is one token, plus the <s> and </s> markers
+            texts = [" ".join(["good"] * max(1, length - 2))] * batch_size
+            started = time.perf_counter()
+            self._infer(texts)
+            timings.append({
+                "batch_size": batch_size,
+                "length": length,
+                "ms": round((time.perf_counter() - started) * 1000, 1)
+            })
+        print(f"[INFO] Warmup finished: {timings}")
+        return timings
+
+    def compare_with_torch(self, texts, repeats=3):
+        """Check the active backend against plain PyTorch for label parity and latency."""
+        reference = TorchBackend(self.model, self.device)
+        return compare_backends(self.tokenizer, reference, self.inference, texts,
+                                max_length=self.max_length, batch_size=self.batch_size, repeats=repeats)
+
+    def _item_text(self, item):
+        return item.get("cleaned_text") or item.get("original_text") or ""
+
+    def _build_record(self, item, text, sentiment):
+        if isinstance(item, SocialMediaRecord):
+            return SentimentRecord(
+                id=item.id,
+                platform=item.platform,
+                text=text,
+                username=item.username,
+                timestamp=item.timestamp,
+                sentiment=sentiment["sentiment_category"],
+                sentiment_score=sentiment["sentiment_score"],
+                hashtags=item.hashtags,
+                likes=item.likes,
+                shares=item.shares
+            )
+        return SentimentRecord(
+            id=item.get("id"),
+            platform=item.get("platform"),
+            text=text,
+            username=item.get("username"),
+            timestamp=item.get("date_time") or item.get("timestamp"),
+            sentiment=sentiment["sentiment_category"],
+            sentiment_score=sentiment["sentiment_score"],
+            hashtags=item.get("hashtags", []),
+            likes=item.get("tweet_like_count") or item.get("likes_count"),
+            shares=item.get("tweet_retweet_count") or item.get("shares")
+        )
+
+    def _build_result(self, item, text, sentiment):
+        return self._build_record(item, text, sentiment).to_dict()
+
     def _analyze_single_item(self, item):
-        text = item.get("cleaned_text") or item.get("original_text") or ""
-        sentiment = self._predict_sentiment(text)
+        text = self._item_text(item)
+        return self._build_result(item, text, self._predict_sentiment(text))
 
-        return {
-            "id": item.get("id"),
-            "platform": item.get("platform"),
-            "text": text,
-            "username": item.get("username"),
-            "timestamp": item.get("date_time") or item.get("timestamp"),
-            "sentiment": sentiment["sentiment_category"],
-            "sentiment_score": sentiment["sentiment_score"],
-            "hashtags": item.get("hashtags", []),
-            "metrics": {
-                "likes": item.get("tweet_like_count") or item.get("likes_count"),
-                "shares": item.get("tweet_retweet_count") or item.get("shares")
-            }
-        }
-    def analyze_social_media_data(self, data):
+    def analyze_social_media_data(self, data, predict=None, records=False):
+        """
+        Score items and build result dicts. `predict` replaces predict_texts,
+        e.g. to route texts through a shared MicroBatcher. records=True returns
+        SentimentRecords, to be turned into dicts only at the API boundary.
+        """
         if not data:
             return []
 
-        if self.device.type == "cuda":
-            # GPU: sequential batch (ThreadPool not safe with CUDA)
-            return [self._analyze_single_item(item) for item in data]
+        # Tokenize and score all texts together instead of one forward pass per item
+        texts = [self._item_text(item) for item in data]
+        if predict is not None:
+            sentiments = predict(texts)
         else:
-            # CPU: parallel execution
-            with ThreadPoolExecutor(max_workers=6) as executor:
-                return list(executor.map(self._analyze_single_item, data))
+            sentiments = self.predict_texts(texts)
+            stats = self.last_dedup_stats
+            print(f"[INFO] Scored {stats['texts']} texts ({stats['unique_texts']} unique, dedup ratio {stats['dedup_ratio']:.0%})")
+
+        build = self._build_record if records else self._build_result
+        return [
+            build(item, text, sentiment)
+            for item, text, sentiment in zip(data, texts, sentiments)
+        ]
+
+    def iter_analyze_social_media_data(self, data, chunk_size=None, predict=None, records=False):
+        """
+        Streaming variant of analyze_social_media_data: consumes any iterable of
+        preprocessed items and yields one list of results per chunk, so only a
+        chunk of items is held in memory at a time.
+        """
+        chunk_size = chunk_size or self.batch_size * 8
+        chunk = []
+        for item in data:
+            chunk.append(item)
+            if len(chunk) >= chunk_size:
+                yield self.analyze_social_media_data(chunk, predict=predict, records=records)
+                chunk = []
+        if chunk:
+            yield self.analyze_social_media_data(chunk, predict=predict, records=records)
+
+def _parse_duration(value: Optional[str]) -> Optional[float]:
+    """Parse rate-limit durations such as '2', '1.5s', '20ms' or '6m0s' into seconds."""
+    if not value:
+        return None
+    try:
+        return float(value)
+    except ValueError:
+        pass
+    parts = re.findall(r'(\d+(?:\.\d+)?)(ms|h|m|s)', value)
+    if not parts:
+        return None
+    units = {'h': 3600, 'm': 60, 's': 1, 'ms': 0.001}
+    return sum(float(amount) * units[unit] for amount, unit in parts)
+
+def _header_float(headers, *names) -> Optional[float]:
+    """First of `names` present in headers, as a float; None if missing or not a number."""
+    for name in names:
+        value = headers.get(name)
+        if value is not None:
+            try:
+                return float(value)
+            except ValueError:
+                return None
+    return None
+
+class TokenBucket:
+    """
+    Thread-safe token bucket driven by the server's rate-limit headers.
+    Without a `rate` it does not throttle until a response advertises its
+    limit; from then on it refills at the rate implied by the limit, the
+    remaining requests and the time until reset, up to the advertised limit.
+    An explicit `rate` is an opt-in cap until the headers say otherwise.
+    """
+
+    def __init__(self, rate: Optional[float] = None, capacity: Optional[float] = None):
+        if rate is not None and rate <= 0:
+            raise ValueError("rate must be positive")
+        self.rate = rate
+        self.capacity = capacity or (max(1.0, rate) if rate else None)
+        self.tokens = self.capacity
+        self.updated_at = time.monotonic()
+        self.paused_until = 0.0
+        self._lock = threading.Lock()
+
+    def _refill(self, now):
+        if self.rate is not None:
+            self.tokens = min(self.capacity, self.tokens + (now - self.updated_at) * self.rate)
+        self.updated_at = now
+
+    def acquire(self):
+        """Block until a token is available (or a pause has passed, while uncapped), then take it."""
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                self._refill(now)
+                if now >= self.paused_until:
+                    if self.rate is None:
+                        return
+                    if self.tokens >= 1:
+                        self.tokens -= 1
+                        return
+                wait = self.paused_until - now
+                if self.rate is not None:
+                    wait = max(wait, (1 - self.tokens) / self.rate)
+            time.sleep(wait)
+
+    def pause(self, seconds: float):
+        """Stop handing out tokens for `seconds` (e.g. after a 429 with Retry-After)."""
+        with self._lock:
+            self.paused_until = max(self.paused_until, time.monotonic() + seconds)
+            if self.rate is not None:
+                self.tokens = 0
+
+    def update_from_headers(self, headers):
+        """Take the limit, remaining requests and time until reset from a response."""
+        limit = _header_float(headers, 'x-ratelimit-limit-requests', 'x-ratelimit-limit')
+        remaining = _header_float(headers, 'x-ratelimit-remaining-requests', 'x-ratelimit-remaining')
+        reset = _parse_duration(headers.get('x-ratelimit-reset-requests') or headers.get('x-ratelimit-reset'))
+        if remaining is None:
+            return
+
+        with self._lock:
+            now = time.monotonic()
+            self._refill(now)
+            if limit and limit > 0 and reset and limit > remaining:
+                # The spent requests (limit - remaining) come back by the reset time
+                was_capped = self.rate is not None
+                self.rate = (limit - remaining) / reset
+                self.capacity = limit
+                self.tokens = min(self.tokens, remaining) if was_capped else remaining
+            elif self.rate is not None:
+                self.tokens = min(self.tokens, remaining)
+            if remaining < 1 and reset:
+                self.paused_until = max(self.paused_until, now + reset)
 
 class GrokSentimentAnalyzer:
-    def __init__(self, api_key: str, model: str = "Grok-3"):
-        """Initialize the Grok sentiment analyzer with API credentials."""
+    def __init__(self, api_key: str, model: str = "Grok-3", base_url: Optional[str] = None,
+                 max_concurrency: int = 4, requests_per_second: Optional[float] = None,
+                 max_retries: int = 3, backoff: float = 0.5, timeout: float = 30.0):
+        """
+        Initialize the Grok sentiment analyzer with API credentials.
+        Requests are paced by the API's rate-limit headers; `requests_per_second`
+        (or GROK_REQUESTS_PER_SECOND) adds a client-side cap until they arrive.
+        """
+        if max_concurrency <= 0:
+            raise ValueError("max_concurrency must be a positive integer")
         self.api_key = api_key
         self.model = model
-        self.base_url = "https://api.mcp.com/v1"  # Update with actual MCP API endpoint
+        # Update with actual MCP API endpoint; override to point at a local stub server
+        self.base_url = base_url or os.getenv("GROK_BASE_URL", "https://api.mcp.com/v1")
         self.headers = {
             "Authorization": f"Bearer {api_key}",
             "Content-Type": "application/json"
         }
+        self.max_concurrency = max_concurrency
+        self.max_retries = max_retries
+        self.backoff = backoff
+        self.timeout = timeout
+        requests_per_second = requests_per_second or os.getenv("GROK_REQUESTS_PER_SECOND")
+        self.rate_limiter = TokenBucket(float(requests_per_second) if requests_per_second else None)
+
+        # Pooled keep-alive connections, one per concurrent request
+        self.session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=max_concurrency, pool_maxsize=max_concurrency)
+        self.session.mount("http://", adapter)
+        self.session.mount("https://", adapter)
+        self.session.headers.update(self.headers)
         
     def _create_sentiment_prompt(self, texts: List[str]) -> str:
         """Create a prompt for batch sentiment analysis."""
@@ -121,119 +497,131 @@ class GrokSentimentAnalyzer:
         prompt += '[{"sentiment": "Positive", "score": 0.8}, {"sentiment": "Negative", "score": -0.6}, ...]\n'
         
         return prompt
+
+    def _analyze_one_batch(self, batch: List[str]) -> List[Dict[str, Any]]:
+        """Score one batch of texts; falls back to neutral if the call or its output is unusable."""
+        fallback = [{"sentiment": "Neutral", "score": 0.0} for _ in batch]
+        
+        try:
+            response = self._call_grok_api(self._create_sentiment_prompt(batch))
+            if not response:
+                return fallback
+                
+            batch_results = json.loads(response)
+            if not isinstance(batch_results, list) or len(batch_results) != len(batch):
+                print(f"Error in sentiment analysis batch: expected {len(batch)} results, got {batch_results!r:.200}")
+                return fallback
+            return batch_results
+            
+        except Exception as e:
+            print(f"Error in sentiment analysis batch: {e}")
+            return fallback
         
     def analyze_batch(self, texts: List[str], batch_size: int = 10) -> List[Dict[str, Any]]:
         """
         Analyze sentiment for a batch of texts to optimize API calls.
-        Returns a list of sentiment results, one for each text.
+        Batches are sent concurrently (up to max_concurrency) under the rate
+        limiter. Returns a list of sentiment results, one for each text, in order.
         """
+        batches = [texts[i:i+batch_size] for i in range(0, len(texts), batch_size)]
+        if not batches:
+            return []
+        
         all_results = []
+        with ThreadPoolExecutor(max_workers=min(self.max_concurrency, len(batches))) as executor:
+            for batch_results in executor.map(self._analyze_one_batch, batches):
+                all_results.extend(batch_results)
+                    
+        return all_results
         
-        # Process texts in batches
-        for i in range(0, len(texts), batch_size):
-            batch = texts[i:i+batch_size]
-            
-            # Create prompt for this batch
-            prompt = self._create_sentiment_prompt(batch)
-            
+    def _call_grok_api(self, prompt: str) -> Optional[str]:
+        """
+        Call the Grok API through MCP and return the text response.
+        429 and 5xx responses and connection errors are retried with exponential
+        backoff, honouring Retry-After when the server sends it.
+        """
+        payload = {
+            "model": self.model,
+            "messages": [
+                {"role": "system", "content": "You are a helpful assistant that analyzes sentiment."},
+                {"role": "user", "content": prompt}
+            ],
+            "temperature": 0.1  # Low temperature for more consistent responses
+        }
+        
+        for attempt in range(self.max_retries + 1):
+            delay = self.backoff * (2 ** attempt)
             try:
-                # Call Grok API
-                response = self._call_grok_api(prompt)
+                self.rate_limiter.acquire()
+                response = self.session.post(
+                    f"{self.base_url}/completions",
+                    json=payload,
+                    timeout=self.timeout
+                )
+                self.rate_limiter.update_from_headers(response.headers)
                 
-                # Parse the response
-                if response:
-                    batch_results = json.loads(response)
-                    all_results.extend(batch_results)
-                else:
-                    # If API call failed, add neutral sentiment as fallback
-                    for _ in batch:
-                        all_results.append({"sentiment": "Neutral", "score": 0.0})
-                        
-                # Add a small delay to avoid rate limits
-                time.sleep(0.5)
+                if response.status_code == 200:
+                    result = response.json()
+                    return result["choices"][0]["message"]["content"]
+                    
+                if response.status_code != 429 and response.status_code < 500:
+                    print(f"API error: {response.status_code}, {response.text}")
+                    return None
+                    
+                retry_after = _parse_duration(response.headers.get("Retry-After"))
+                if retry_after is not None:
+                    delay = retry_after
+                if response.status_code == 429:
+                    self.rate_limiter.pause(delay)
+                print(f"API error: {response.status_code}, retrying in {delay:.2f}s ({attempt + 1}/{self.max_retries})")
                 
+            except (requests.ConnectionError, requests.Timeout) as e:
+                print(f"Error calling Grok API: {e}, retrying in {delay:.2f}s ({attempt + 1}/{self.max_retries})")
             except Exception as e:
-                print(f"Error in sentiment analysis batch: {e}")
-                # Add neutral sentiment as fallback for this batch
-                for _ in batch:
-                    all_results.append({"sentiment": "Neutral", "score": 0.0})
-                    
-        return all_results
-        
-    def _call_grok_api(self, prompt: str) -> Optional[str]:
-        """Call the Grok API through MCP and return the text response."""
-        try:
-            payload = {
-                "model": self.model,
-                "messages": [
-                    {"role": "system", "content": "You are a helpful assistant that analyzes sentiment."},
-                    {"role": "user", "content": prompt}
-                ],
-                "temperature": 0.1  # Low temperature for more consistent responses
-            }
-            
-            response = requests.post(
-                f"{self.base_url}/completions",
-                headers=self.headers,
-                json=payload
-            )
-            
-            if response.status_code == 200:
-                result = response.json()
-                return result["choices"][0]["message"]["content"]
-            else:
-                print(f"API error: {response.status_code}, {response.text}")
+                print(f"Error calling Grok API: {e}")
                 return None
                 
-        except Exception as e:
-            print(f"Error calling Grok API: {e}")
-            return None
+            if attempt < self.max_retries:
+                time.sleep(delay)
+                
+        print(f"Giving up on Grok API call after {self.max_retries + 1} attempts")
+        return None
             
     def analyze_social_media_data(self, data: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
-        """Add sentiment analysis to social media data."""
-        analyzed_data = []
+        """
+        Add sentiment analysis to social media data (items and their comments).
+        Every input item is returned, in input order; items without
+        `cleaned_text` are passed through unscored.
+        """
         texts_to_analyze = []
-        item_map = []  # To map analyzed texts back to their items
+        targets = []  # (item index, comment index or None) for each text
         
         # Collect all texts for batch analysis
-        for item in data:
+        for item_index, item in enumerate(data):
             if 'cleaned_text' in item:
                 texts_to_analyze.append(item['cleaned_text'])
-                item_map.append(('item', item))
+                targets.append((item_index, None))
                 
             # Also analyze comments if available
             if 'comments' in item and isinstance(item['comments'], list):
-                for comment in item['comments']:
+                for comment_index, comment in enumerate(item['comments']):
                     if 'cleaned_text' in comment:
                         texts_to_analyze.append(comment['cleaned_text'])
-                        item_map.append(('comment', comment))
+                        targets.append((item_index, comment_index))
                         
         # Perform batch analysis
-        if texts_to_analyze:
-            sentiment_results = self.analyze_batch(texts_to_analyze)
+        analyzed_data = list(data)
+        if not texts_to_analyze:
+            return analyzed_data
             
-            # Map results back to items
-            for (item_type, item_data), sentiment in zip(item_map, sentiment_results):
-                item_data['sentiment'] = sentiment['sentiment']
-                item_data['sentiment_score'] = sentiment['score']
-                
-        # Reorganize data back into the original structure
-        processed_items = {}
-        for item_type, item_data in item_map:
-            if item_type == 'item':
-                item_id = item_data['id']
-                processed_items[item_id] = item_data
-                
-        # Add comments back to their parent items
-        for item_type, item_data in item_map:
-            if item_type == 'comment':
-                for item_id, item in processed_items.items():
-                    if 'comments' in item:
-                        for i, comment in enumerate(item['comments']):
-                            if comment['id'] == item_data['id']:
-                                item['comments'][i] = item_data
-                                
-        # Convert back to list
-        analyzed_data = list(processed_items.values())
+        sentiment_results = self.analyze_batch(texts_to_analyze)
         
-        return analyzed_data
\ No newline at end of file
+        # Write each result straight to its (item, comment) position in one pass
+        for (item_index, comment_index), sentiment in zip(targets, sentiment_results):
+            target = analyzed_data[item_index]
+            if comment_index is not None:
+                target = target['comments'][comment_index]
+            target['sentiment'] = sentiment['sentiment']
+            target['sentiment_score'] = sentiment['score']
+            
+        return analyzed_data
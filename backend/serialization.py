@@ -0,0 +1,148 @@
+# backend/serialization.py
+
+import gzip
+import json
+import os
+import sys
+from collections.abc import Mapping
+from datetime import date, datetime, time
+from decimal import Decimal
+from typing import Any, Optional
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+
+def _default(obj: Any) -> Any:
+    """Convert values the JSON encoders do not know about into plain JSON types."""
+    if hasattr(obj, 'to_dict') and isinstance(obj, Mapping):
+        return obj.to_dict()
+
+    # numpy/pandas are only checked when already imported: anything of their
+    # types means the module is loaded, and the codec stays cheap to import
+    pd = sys.modules.get('pandas')
+    if pd is not None:
+        if obj is pd.NaT or obj is getattr(pd, 'NA', None):
+            return None
+        if isinstance(obj, pd.Timestamp):
+            return obj.isoformat()
+        if isinstance(obj, pd.Timedelta):
+            return obj.total_seconds()
+        if isinstance(obj, pd.DataFrame):
+            return obj.to_dict(orient='records')
+        if isinstance(obj, (pd.Series, pd.Index)):
+            return obj.tolist()
+
+    np = sys.modules.get('numpy')
+    if np is not None:
+        if isinstance(obj, np.ndarray):
+            return obj.tolist()
+        if isinstance(obj, np.datetime64):
+            return None if np.isnat(obj) else str(obj)
+        if isinstance(obj, np.generic):
+            return obj.item()
+
+    if isinstance(obj, (datetime, date, time)):
+        return obj.isoformat()
+    if isinstance(obj, Mapping):
+        return dict(obj)
+    if isinstance(obj, (set, frozenset, tuple)):
+        return list(obj)
+    if isinstance(obj, Decimal):
+        return float(obj)
+    if isinstance(obj, bytes):
+        return obj.decode('utf-8', errors='replace')
+    raise TypeError(f"Object of type {type(obj).__name__} is not JSON serializable")
+
+
+class JSONCodec:
+    """
+    JSON encode/decode through orjson when it is installed, falling back to
+    the standard library. `JSON_CODEC` picks one explicitly ("orjson"/"json").
+    Both produce compact UTF-8 bytes and share the same conversions for
+    numpy, pandas and datetime values.
+    """
+
+    def __init__(self, name: Optional[str] = None):
+        name = (name or os.getenv("JSON_CODEC", "auto")).lower()
+        if name == "auto":
+            name = "orjson" if orjson is not None else "json"
+        if name == "orjson" and orjson is None:
+            print("[WARNING] JSON_CODEC=orjson but orjson is not installed, using json")
+            name = "json"
+        if name not in ("orjson", "json"):
+            raise ValueError(f"Unknown JSON codec: {name}")
+        self.name = name
+
+    def dumps(self, obj: Any) -> bytes:
+        if self.name == "orjson":
+            return orjson.dumps(obj, default=_default,
+                                option=orjson.OPT_SERIALIZE_NUMPY | orjson.OPT_NON_STR_KEYS)
+        return json.dumps(obj, default=_default, ensure_ascii=False,
+                          separators=(',', ':')).encode('utf-8')
+
+    def loads(self, data) -> Any:
+        if self.name == "orjson":
+            return orjson.loads(data)
+        if isinstance(data, (bytes, bytearray, memoryview)):
+            data = bytes(data).decode('utf-8')
+        return json.loads(data)
+
+
+codec = JSONCodec()
+
+
+def dumps(obj: Any) -> bytes:
+    return codec.dumps(obj)
+
+
+def loads(data) -> Any:
+    return codec.loads(data)
+
+
+def available_encodings():
+    return ("br", "gzip") if brotli is not None else ("gzip",)
+
+
+def negotiate_encoding(accept_encoding: Optional[str]) -> Optional[str]:
+    """Best content coding we support from an Accept-Encoding header, or None."""
+    if not accept_encoding:
+        return None
+
+    weights = {}
+    for part in accept_encoding.split(','):
+        coding, _, params = part.strip().partition(';')
+        coding = coding.strip().lower()
+        if not coding:
+            continue
+        weight = 1.0
+        params = params.strip()
+        if params.startswith('q='):
+            try:
+                weight = float(params[2:])
+            except ValueError:
+                weight = 0.0
+        weights[coding] = weight
+
+    best, best_weight = None, 0.0
+    for coding in available_encodings():
+        weight = weights.get(coding, weights.get('*', 0.0))
+        if weight > best_weight:
+            best, best_weight = coding, weight
+    return best
+
+
+def compress(body: bytes, encoding: str) -> bytes:
+    """Compress a response body; levels favour speed since this runs per request."""
+    if encoding == "br":
+        return brotli.compress(body, quality=int(os.getenv("RESPONSE_BROTLI_QUALITY", 4)))
+    if encoding == "gzip":
+        return gzip.compress(body, compresslevel=int(os.getenv("RESPONSE_GZIP_LEVEL", 5)))
+    raise ValueError(f"Unsupported content encoding: {encoding}")
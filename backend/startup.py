@@ -0,0 +1,78 @@
+# backend/startup.py
+
+import logging
+import threading
+import time
+import traceback
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+
+class BackgroundInitializer:
+    """
+    Run named startup steps (model loading, warmup, ...) in a background thread
+    and expose their progress, so the server can answer requests while it loads.
+    """
+
+    def __init__(self, steps: List[Tuple[str, Callable[[], Any]]]):
+        self.steps = steps
+        self.state = "pending"
+        self.current_step: Optional[str] = None
+        self.completed: List[Dict[str, Any]] = []
+        self.error: Optional[str] = None
+        self.started_at: Optional[float] = None
+        self.finished_at: Optional[float] = None
+        self._ready = threading.Event()
+        self._start_lock = threading.Lock()
+        self._thread = threading.Thread(target=self._run, name="background-initializer", daemon=True)
+
+    def start(self):
+        """Start loading; later calls are no-ops, so it can be called per request."""
+        with self._start_lock:
+            if self.started_at is None:
+                self.started_at = time.time()
+                self.state = "loading"
+                self._thread.start()
+        return self
+
+    def _run(self):
+        for name, step in self.steps:
+            self.current_step = name
+            step_started = time.time()
+            logger.info(f"Startup step '{name}' started")
+            try:
+                step()
+            except Exception as e:
+                self.state = "failed"
+                self.error = f"{name}: {e}"
+                logger.error(f"Startup step '{name}' failed: {traceback.format_exc()}")
+                return
+            duration = round(time.time() - step_started, 3)
+            self.completed.append({"step": name, "seconds": duration})
+            logger.info(f"Startup step '{name}' finished in {duration}s")
+
+        self.current_step = None
+        self.state = "ready"
+        self.finished_at = time.time()
+        self._ready.set()
+
+    @property
+    def ready(self) -> bool:
+        return self._ready.is_set()
+
+    def wait(self, timeout: Optional[float] = None) -> bool:
+        return self._ready.wait(timeout)
+
+    def status(self) -> Dict[str, Any]:
+        elapsed_until = self.finished_at or time.time()
+        return {
+            "state": self.state,
+            "ready": self.ready,
+            "progress": round(len(self.completed) / len(self.steps) * 100, 1) if self.steps else 100.0,
+            "current_step": self.current_step,
+            "completed_steps": self.completed,
+            "pending_steps": [name for name, _ in self.steps[len(self.completed):]],
+            "elapsed_seconds": round(elapsed_until - self.started_at, 3) if self.started_at else 0.0,
+            "error": self.error
+        }
@@ -1,7 +1,8 @@
 import logging
-from typing import List, Dict, Any, Tuple, Optional, Callable
+from typing import List, Dict, Any, Tuple, Optional, Callable, Iterable
 from datetime import datetime
 from collections import Counter, defaultdict
+from collections.abc import Iterator, Mapping
 import math
 import json
 import re
@@ -31,7 +32,8 @@ class TrendAnalyzer:
             return False
         
         for i, item in enumerate(data):
-            if not isinstance(item, dict):
+            # Dicts, or the slotted pipeline records from backend.records
+            if not isinstance(item, Mapping):
                 logger.error(f"Item at index {i} is not a dictionary")
                 return False
                 
@@ -310,6 +312,82 @@ class TrendAnalyzer:
                 'error': str(e)
             }
     
+    def hashtag_aggregator(self) -> 'HashtagAggregator':
+        """Create an incremental hashtag aggregator bound to this analyzer."""
+        return HashtagAggregator(self)
+
+    def analysis_summary(self) -> 'AnalysisSummary':
+        """Create an empty, mergeable summary (sentiment counts, mean score, hashtags)."""
+        return AnalysisSummary(self)
+
+    def summarize(self, data: Iterable[Dict[str, Any]],
+                  progress_callback: Optional[Callable] = None) -> 'AnalysisSummary':
+        """Summarize scored items in one pass, in batches of batch_size."""
+        # Generators are consumed once, so only materialized input is validated up front
+        if not isinstance(data, Iterator) and not self._validate_input_data(data):
+            raise ValueError("Invalid input data")
+
+        summary = self.analysis_summary()
+        total = len(data) if hasattr(data, '__len__') else None
+        batch = []
+        processed = 0
+
+        for item in data:
+            batch.append(item)
+            if len(batch) >= self.batch_size:
+                summary.update(batch)
+                processed += len(batch)
+                batch = []
+                if progress_callback:
+                    progress_callback(processed / total * 100 if total else None, processed)
+
+        if batch:
+            summary.update(batch)
+            processed += len(batch)
+            if progress_callback:
+                progress_callback(100.0 if total else None, processed)
+
+        return summary
+
+    def analyze_hashtags_stream(self, data: Iterable[Dict[str, Any]], top_n: int = 5,
+                                progress_callback: Optional[Callable] = None) -> Dict[str, Any]:
+        """
+        Streaming variant of analyze_hashtags: consumes any iterable in batches of
+        batch_size and keeps only per-hashtag running totals, so memory stays flat
+        regardless of input size.
+        """
+        aggregator = self.hashtag_aggregator()
+        batch = []
+        processed = 0
+        
+        try:
+            for item in data:
+                batch.append(item)
+                if len(batch) >= self.batch_size:
+                    aggregator.update(batch)
+                    processed += len(batch)
+                    batch = []
+                    if progress_callback:
+                        progress_callback(None, processed)
+                        
+            if batch:
+                aggregator.update(batch)
+                processed += len(batch)
+                if progress_callback:
+                    progress_callback(None, processed)
+                    
+            return aggregator.result(top_n)
+            
+        except Exception as e:
+            logger.error(f"Streaming hashtag analysis failed: {str(e)}", exc_info=True)
+            return {
+                'top_hashtags': [],
+                'total_hashtags': 0,
+                'unique_hashtags': 0,
+                'hashtag_durations': {},
+                'error': str(e)
+            }
+    
     def get_sentiment_distribution(self, data: List[Dict[str, Any]],
                                   progress_callback: Optional[Callable] = None) -> Dict[str, int]:
         """Get sentiment distribution with robust error handling"""
@@ -1011,4 +1089,200 @@ class TrendAnalyzer:
         except Exception as e:
             summary['error'] = str(e)
             
-        return summary
\ No newline at end of file
+        return summary
+
+
+def _to_number(value: Any) -> Optional[float]:
+    """Score or count as a number, coercing numeric strings; None if it is not one."""
+    if isinstance(value, (int, float)):
+        return value if math.isfinite(value) else None
+    try:
+        number = float(value)
+    except (TypeError, ValueError):
+        return None
+    return number if math.isfinite(number) else None
+
+
+class HashtagAggregator:
+    """
+    Incremental, mergeable version of TrendAnalyzer.analyze_hashtags. Keeps
+    running per-hashtag totals instead of one record per hashtag occurrence.
+    """
+    
+    def __init__(self, trend_analyzer: TrendAnalyzer):
+        self.trend_analyzer = trend_analyzer
+        self.counts = Counter()
+        # hashtag -> [sentiment_sum, sentiment_n, likes, retweets, replies, comments]
+        self.totals = defaultdict(lambda: [0.0, 0, 0, 0, 0, 0])
+        self.first_use = {}
+        self.last_use = {}
+        
+    def _add(self, tag: str, sentiment_score, likes, retweets, replies, comments, timestamp):
+        tag = tag.lower()
+        self.counts[tag] += 1
+        totals = self.totals[tag]
+        if sentiment_score is not None:
+            totals[0] += sentiment_score
+            totals[1] += 1
+        totals[2] += likes or 0
+        totals[3] += retweets or 0
+        totals[4] += replies or 0
+        totals[5] += comments
+        
+        if timestamp:
+            if tag not in self.first_use or timestamp < self.first_use[tag]:
+                self.first_use[tag] = timestamp
+            if tag not in self.last_use or timestamp > self.last_use[tag]:
+                self.last_use[tag] = timestamp
+                
+    def add_item(self, item: Dict[str, Any]):
+        """
+        Fold one item (and its comments) into the running totals. Malformed
+        parts are skipped rather than failing the whole batch: non-dict items
+        and comments, non-string tags, and scores or counts that are not numbers.
+        """
+        if not isinstance(item, Mapping):
+            return
+        parse_timestamp = self.trend_analyzer._parse_timestamp
+
+        hashtags = item.get('hashtags')
+        if isinstance(hashtags, list) and hashtags:
+            timestamp = parse_timestamp(item.get('timestamp') or item.get('created_at'))
+            sentiment_score = _to_number(item.get('sentiment_score', 0))
+            likes = _to_number(item.get('like_count', 0))
+            retweets = _to_number(item.get('retweet_count', 0))
+            replies = _to_number(item.get('reply_count', 0))
+            for tag in hashtags:
+                if isinstance(tag, str):
+                    self._add(tag, sentiment_score, likes, retweets, replies, 0, timestamp)
+                
+        comments = item.get('comments')
+        if isinstance(comments, list):
+            for comment in comments:
+                if not isinstance(comment, Mapping):
+                    continue
+                comment_hashtags = comment.get('hashtags')
+                if isinstance(comment_hashtags, list) and comment_hashtags:
+                    comment_timestamp = parse_timestamp(comment.get('timestamp'))
+                    comment_sentiment = _to_number(comment.get('sentiment_score', 0))
+                    for tag in comment_hashtags:
+                        if isinstance(tag, str):
+                            self._add(tag, comment_sentiment, 0, 0, 0, 1, comment_timestamp)
+
+    def update(self, items: Iterable[Dict[str, Any]]) -> 'HashtagAggregator':
+        """Fold a chunk of items (and their comments) into the running totals."""
+        for item in items:
+            self.add_item(item)
+        return self
+        
+    def merge(self, other: 'HashtagAggregator') -> 'HashtagAggregator':
+        """Combine totals from another aggregator, e.g. one built on a different chunk."""
+        self.counts.update(other.counts)
+        for tag, other_totals in other.totals.items():
+            totals = self.totals[tag]
+            for i, value in enumerate(other_totals):
+                totals[i] += value
+        for tag, timestamp in other.first_use.items():
+            if tag not in self.first_use or timestamp < self.first_use[tag]:
+                self.first_use[tag] = timestamp
+        for tag, timestamp in other.last_use.items():
+            if tag not in self.last_use or timestamp > self.last_use[tag]:
+                self.last_use[tag] = timestamp
+        return self
+        
+    def result(self, top_n: int = 5) -> Dict[str, Any]:
+        """Build the same structure analyze_hashtags returns."""
+        top_hashtags = []
+        for hashtag, count in self.counts.most_common(top_n):
+            sentiment_sum, sentiment_n, likes, retweets, replies, comments = self.totals[hashtag]
+            avg_sentiment = sentiment_sum / sentiment_n if sentiment_n else 0
+            top_hashtags.append({
+                'hashtag': hashtag,
+                'count': count,
+                'avg_sentiment': float(avg_sentiment),
+                'sentiment_category': self.trend_analyzer._categorize_sentiment(avg_sentiment),
+                'engagement': {
+                    'avg_likes': float(likes / count),
+                    'avg_retweets': float(retweets / count),
+                    'avg_replies': float(replies / count),
+                    'avg_comments': float(comments / count),
+                    'total_engagement': float(likes + retweets + replies + comments)
+                }
+            })
+            
+        hashtag_durations = {
+            tag: (self.last_use[tag] - first_use).days
+            for tag, first_use in self.first_use.items()
+            if tag in self.last_use
+        }
+        
+        return {
+            'top_hashtags': top_hashtags,
+            'total_hashtags': sum(self.counts.values()),
+            'unique_hashtags': len(self.counts),
+            'hashtag_durations': hashtag_durations
+        }
+
+
+class AnalysisSummary:
+    """
+    One-pass, mergeable summary of scored items: sentiment counts, mean
+    score and hashtag aggregates. Chunks can be folded in with update() as
+    they are scored, and summaries of separate chunks combined with merge().
+    """
+
+    def __init__(self, trend_analyzer: TrendAnalyzer):
+        self.trend_analyzer = trend_analyzer
+        self.total = 0
+        self.score_sum = 0.0
+        self.sentiment_counts = Counter()
+        self.hashtags = HashtagAggregator(trend_analyzer)
+
+    def add_item(self, item: Dict[str, Any]):
+        if not isinstance(item, Mapping):
+            return
+        # A score that is not a number counts as 0, like a missing one
+        score = _to_number(item.get('sentiment_score'))
+        category = item.get('sentiment') or item.get('sentiment_category')
+        if category is None and score is not None:
+            category = self.trend_analyzer._categorize_sentiment(score)
+
+        self.total += 1
+        self.score_sum += score or 0
+        if isinstance(category, str) and category:
+            self.sentiment_counts[category] += 1
+        self.hashtags.add_item(item)
+
+    def update(self, items: Iterable[Dict[str, Any]]) -> 'AnalysisSummary':
+        for item in items:
+            self.add_item(item)
+        return self
+
+    def merge(self, other: 'AnalysisSummary') -> 'AnalysisSummary':
+        self.total += other.total
+        self.score_sum += other.score_sum
+        self.sentiment_counts.update(other.sentiment_counts)
+        self.hashtags.merge(other.hashtags)
+        return self
+
+    def sentiment_distribution(self) -> Dict[str, int]:
+        return {
+            "positive": self.sentiment_counts["Positive"],
+            "neutral": self.sentiment_counts["Neutral"],
+            "negative": self.sentiment_counts["Negative"]
+        }
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "total_analyzed": self.total,
+            "sentiment_distribution": self.sentiment_distribution(),
+            "average_sentiment": round(self.score_sum / self.total, 3) if self.total else "NaN"
+        }
+
+    def result(self, top_n: int = 5) -> Dict[str, Any]:
+        """Stats, distribution and hashtag analysis in the shape /analyze returns."""
+        return {
+            "stats": self.stats(),
+            "sentiment_distribution": self.sentiment_distribution(),
+            "hashtag_analysis": self.hashtags.result(top_n)
+        }
@@ -0,0 +1,143 @@
+# benchmarks/text_cleaning.py
+#
+# Parity check and micro-benchmark for TextPreprocessor.clean_text and
+# clean_and_extract (the single-scan path used by the pipeline).
+# Run from the repository root:  python -m benchmarks.text_cleaning
+# The parity checks also run under pytest (tests/test_text_cleaning.py).
+
+import random
+import re
+import sys
+import timeit
+
+from backend.text_processor import TextPreprocessor
+
+
+def legacy_clean_text(text: str) -> str:
+    """The original eight-pass clean_text, kept as the parity reference."""
+    if not text:
+        return ""
+    text = text.lower()
+    text = re.sub(r'https?://\S+|www\.\S+', '', text)
+    text = re.sub(r'@\w+', '', text)
+    text = re.sub(r'#(\w+)', r'\1', text)
+    text = re.sub(r'^rt\s+', '', text)
+    emoji_pattern = re.compile(
+        "["
+        u"\U0001F600-\U0001F64F"
+        u"\U0001F300-\U0001F5FF"
+        u"\U0001F680-\U0001F6FF"
+        u"\U0001F700-\U0001F77F"
+        u"\U0001F780-\U0001F7FF"
+        u"\U0001F800-\U0001F8FF"
+        u"\U0001F900-\U0001F9FF"
+        u"\U0001FA00-\U0001FA6F"
+        u"\U0001FA70-\U0001FAFF"
+        u"\U00002702-\U000027B0"
+        u"\U000024C2-\U0001F251"
+        "]+", flags=re.UNICODE)
+    text = emoji_pattern.sub(r'', text)
+    text = re.sub(r'[^\w\s]', '', text)
+    text = re.sub(r'\s+', ' ', text)
+    return text.strip()
+
+
+# Hand-picked cases around the interactions between passes
+PARITY_CORPUS = [
+    "",
+    "   ",
+    "RT @user: Loving the new #iPhone15 😍🔥 https://t.co/abc123",
+    "rt\tretweet marker with a tab",
+    "@bob rt not a retweet marker once the mention is gone",
+    "#rt starts with a hashtag",
+    "rt#www.example.com keeps rt because # blocks the marker",
+    "@http:// a mention, not a URL",
+    "@userhttps://t.co/x mention glued to a URL",
+    "#taghttp://x.com hashtag glued to a URL",
+    "##double #hash #123 #_under_score",
+    "emails like someone@example.com and www.site.org/path?q=1",
+    "中文 текст café naïve İstanbul ß",
+    "Ⓜ️ dingbats ✂️✈️ and arrows → ← ⬆️",
+    "ideographic　space and zero​width",
+    "multiple     spaces\n\nand\r\nnewlines\t\ttabs",
+    "Punctuation!!! ... ??? (brackets) [square] {curly} \"quotes\" 'single'",
+    "🙂🙃😉 only emojis 🤖👾",
+    "So cute #awww... love it",
+    "#http://x.com/#frag and #www.site.org",
+    "fragment links http://x.com/#anchor www.y.org/#z #real",
+]
+
+_FRAGMENTS = [
+    'http://', 'https://', 'www.', 'rt ', 'RT\t', '@', '#', 'a', 'b', '_', '1', ' ', '\n',
+    '.', '/', ':', '😀', '中', '→', '!', 'İ', '　', 'x', 'h', 't', 'w', 's', 'ß', 'Ⓜ', 'rt',
+]
+
+
+def generated_corpus(size: int = 20000, seed: int = 0):
+    """Random strings stitched from fragments that stress the pass ordering."""
+    rng = random.Random(seed)
+    return [''.join(rng.choice(_FRAGMENTS) for _ in range(rng.randint(0, 16))) for _ in range(size)]
+
+
+def check_parity(preprocessor: TextPreprocessor, corpus) -> int:
+    mismatches = 0
+    for text in corpus:
+        expected, actual = legacy_clean_text(text), preprocessor.clean_text(text)
+        if expected != actual:
+            mismatches += 1
+            print(f"MISMATCH {text!r}: expected {expected!r}, got {actual!r}")
+    return mismatches
+
+
+_URL_PATTERN = re.compile(r'https?://\S+|www\.\S+')
+
+
+def reference_clean_and_extract(preprocessor: TextPreprocessor, text: str):
+    """extract_hashtags + preprocess_text, ignoring '#' inside URLs as clean_and_extract does."""
+    masked = _URL_PATTERN.sub(lambda match: match.group(0).replace('#', ' '), text.lower())
+    return preprocessor.extract_hashtags(masked), preprocessor.preprocess_text(text)
+
+
+def check_extract_parity(preprocessor: TextPreprocessor, corpus) -> int:
+    mismatches = 0
+    for text in corpus:
+        expected = reference_clean_and_extract(preprocessor, text)
+        actual = preprocessor.clean_and_extract(text)
+        if expected != actual:
+            mismatches += 1
+            print(f"MISMATCH {text!r}: expected {expected!r}, got {actual!r}")
+    return mismatches
+
+
+def benchmark(func, corpus, repeat: int = 5) -> float:
+    """Best-of-`repeat` cost per text in microseconds."""
+    runs = timeit.repeat(lambda: [func(text) for text in corpus], number=1, repeat=repeat)
+    return min(runs) / len(corpus) * 1e6
+
+
+def main():
+    preprocessor = TextPreprocessor()
+    corpus = PARITY_CORPUS + generated_corpus()
+
+    mismatches = check_parity(preprocessor, corpus)
+    print(f"Parity: {len(corpus) - mismatches}/{len(corpus)} identical")
+
+    extract_mismatches = check_extract_parity(preprocessor, corpus)
+    print(f"clean_and_extract parity: {len(corpus) - extract_mismatches}/{len(corpus)} identical")
+
+    tweets = [text for text in PARITY_CORPUS if text] * 500
+    legacy_us = benchmark(legacy_clean_text, tweets)
+    current_us = benchmark(preprocessor.clean_text, tweets)
+    print(f"legacy clean_text:  {legacy_us:.2f} us/text")
+    print(f"current clean_text: {current_us:.2f} us/text ({legacy_us / current_us:.2f}x)")
+
+    two_pass_us = benchmark(lambda text: (preprocessor.extract_hashtags(text), preprocessor.preprocess_text(text)), tweets)
+    single_us = benchmark(preprocessor.clean_and_extract, tweets)
+    print(f"extract_hashtags + preprocess_text: {two_pass_us:.2f} us/text")
+    print(f"clean_and_extract:                  {single_us:.2f} us/text ({two_pass_us / single_us:.2f}x)")
+
+    return 1 if mismatches or extract_mismatches else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
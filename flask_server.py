@@ -3,22 +3,27 @@
 import os
 os.environ['TF_CPP_MIN_LOG_LEVEL'] = '2'  # Suppress TensorFlow warnings
 
-from flask import Flask, request, jsonify, send_file
+from flask import Flask, Response, request, jsonify, send_file, stream_with_context
+from flask.json.provider import JSONProvider
+from functools import wraps
 from flask_cors import CORS
 import traceback
 import logging
+import math
 from datetime import datetime
 import re
-from threading import Thread
 import requests
 
 from backend.data_collection import TwitterCollector, InstagramCollector
-from backend.text_processor import TextPreprocessor
-from backend.sentiment_analysis import RobertaSentimentAnalyzer, GrokSentimentAnalyzer
 from backend.trend_analysis import TrendAnalyzer
+from backend.micro_batching import MicroBatcher
+from backend.startup import BackgroundInitializer
+from backend.pipeline import prefetch, stream_analysis
+from backend.jobs import JobManager, JobQueueFull
+from backend import serialization
 
 # Import database utility function
-from backend.db_utils import save_analysis_to_mysql
+from backend.db_utils import connect_mysql, save_analysis_to_mysql
 
 # Load environment variables from .env file
 from dotenv import load_dotenv
@@ -29,14 +34,81 @@ logging.basicConfig(level=logging.INFO,
                    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s')
 logger = logging.getLogger(__name__)
 
+class FastJSONProvider(JSONProvider):
+    """Route jsonify() and request.get_json() through backend.serialization."""
+
+    def dumps(self, obj, **kwargs):
+        return serialization.dumps(obj).decode('utf-8')
+
+    def loads(self, s, **kwargs):
+        return serialization.loads(s)
+
+    def response(self, *args, **kwargs):
+        # Build the body as bytes directly instead of str -> bytes
+        obj = self._prepare_response_obj(args, kwargs)
+        return self._app.response_class(serialization.dumps(obj), mimetype='application/json')
+
 app = Flask(__name__)
+app.json = FastJSONProvider(app)
 # Configure CORS to accept requests from the Electron app
 CORS(app, resources={r"/*": {"origins": "*"}})
 
-# Initialize core components
-preprocessor = TextPreprocessor()
-sentiment_analyzer = RobertaSentimentAnalyzer()
+# Core components are loaded in the background so the server can answer
+# /ping and /ready while the transformer model is still loading. Nothing is
+# loaded at import time: spawned worker processes (inference pool,
+# preprocessing pool) re-import this module as __mp_main__ and must not load
+# the models again.
+preprocessor = None
+sentiment_analyzer = None
+sentiment_batcher = None
+sentiment_service = None
 trend_analyzer = TrendAnalyzer()
+job_manager = JobManager()
+
+def _load_text_preprocessor():
+    global preprocessor
+    from backend.text_processor import TextPreprocessor
+    preprocessor = TextPreprocessor(tokenizer=os.getenv('TEXT_TOKENIZER', 'fast')).prepare()
+
+def _load_sentiment_model():
+    global sentiment_analyzer, sentiment_batcher, sentiment_service
+    from backend.sentiment_analysis import RobertaSentimentAnalyzer
+    sentiment_analyzer = RobertaSentimentAnalyzer()
+
+    # Optionally share forward passes across concurrent /analyze requests
+    if float(os.getenv("SENTIMENT_BATCH_WINDOW_MS", 0)) > 0:
+        sentiment_batcher = MicroBatcher(sentiment_analyzer)
+    sentiment_service = sentiment_batcher or sentiment_analyzer
+
+def _warmup_sentiment_model():
+    # Batch shapes as "<batch>x<tokens>" pairs, e.g. "1x16,16x32,32x64"; empty disables warmup
+    spec = os.getenv("SENTIMENT_WARMUP_SHAPES", "1x16,16x32,32x64")
+    shapes = [tuple(int(n) for n in shape.split('x')) for shape in spec.split(',') if shape.strip()]
+    if shapes:
+        sentiment_analyzer.warmup(shapes)
+
+initializer = BackgroundInitializer([
+    ('text_preprocessor', _load_text_preprocessor),
+    ('sentiment_model', _load_sentiment_model),
+    ('warmup', _warmup_sentiment_model)
+])
+
+@app.before_request
+def start_initializer():
+    # Started in __main__ below; WSGI servers that import the app start it on the first request
+    initializer.start()
+
+def requires_models(view):
+    """Answer 503 with load progress until background initialization has finished."""
+    @wraps(view)
+    def wrapper(*args, **kwargs):
+        if not initializer.ready:
+            return jsonify({
+                'error': 'Server is still loading models, try again shortly',
+                'readiness': initializer.status()
+            }), 503
+        return view(*args, **kwargs)
+    return wrapper
 
 @app.route('/', methods=['GET'])
 def home():
@@ -263,89 +335,379 @@ def collect_data():
             'type': type(e).__name__
         }), 500
     
-@app.route('/analyze', methods=['POST'])
-def analyze_data():
-    try:
-        json_payload = request.get_json(force=True, silent=True)
+def _analysis_request_data(endpoint):
+    """Validated 'data' list of an analysis request body, or (None, error response)."""
+    json_payload = request.get_json(force=True, silent=True)
+
+    if not json_payload or not isinstance(json_payload, dict) or "data" not in json_payload:
+        logger.error(f"[ERROR] Invalid JSON payload received at {endpoint}")
+        return None, (jsonify({"error": "Invalid request. JSON body must contain a 'data' field."}), 400)
+
+    raw_data = json_payload["data"]
+
+    if not isinstance(raw_data, list):
+        logger.error("[ERROR] 'data' field is not a list.")
+        return None, (jsonify({"error": "'data' must be a list."}), 400)
+
+    return raw_data, None
+
+def _score_records(processed_data, job=None):
+    """Score preprocessed records; with a job, in chunks that report progress and honour cancellation."""
+    if job is None:
+        return sentiment_service.analyze_social_media_data(processed_data, records=True)
+
+    sentiment_results = []
+    chunks = sentiment_analyzer.iter_analyze_social_media_data(
+        processed_data,
+        chunk_size=int(os.getenv('JOB_CHUNK_SIZE', 256)),
+        predict=sentiment_batcher.predict_texts if sentiment_batcher else None,
+        records=True
+    )
+    for results in chunks:
+        sentiment_results.extend(results)
+        job.update_progress(scored=len(sentiment_results))
+        job.check_cancelled()
+    return sentiment_results
+
+def _run_analysis(raw_data, job=None):
+    """Preprocess, score, aggregate and store raw items; returns the /analyze response body."""
+    def report(**fields):
+        if job is not None:
+            job.update_progress(**fields)
+
+    def callback(make_fields):
+        # Adapts (percent, count) progress callbacks to job progress fields
+        if job is None:
+            return None
+        return lambda percent, count: job.update_progress(**make_fields(count))
+
+    report(force=True, stage='preprocessing', total=len(raw_data), preprocessed=0, scored=0,
+           aggregated=0, aggregation_batches=0, rows_written=0)
+
+    # Slotted records between stages; converted to dicts only for the response
+    processed_data = preprocessor.preprocess_social_media_data(
+        raw_data, records=True,
+        progress_callback=callback(lambda count: {'preprocessed': count})
+    )
+    report(force=True, stage='scoring', preprocessed=len(raw_data), to_score=len(processed_data))
+    if job is not None:
+        job.check_cancelled()
+
+    sentiment_results = _score_records(processed_data, job)
+    report(force=True, stage='aggregating')
+
+    # Sentiment counts, mean score and hashtag aggregates in one pass
+    summary = trend_analyzer.summarize(
+        sentiment_results,
+        progress_callback=callback(lambda count: {
+            'aggregated': count,
+            'aggregation_batches': math.ceil(count / trend_analyzer.batch_size)
+        })
+    )
+    if job is not None:
+        job.check_cancelled()
+    report(force=True, stage='saving')
+
+    # ✅ Store results in MySQL
+    save_analysis_to_mysql(sentiment_results, progress_callback=callback(lambda count: {'rows_written': count}))
+    # save_analysis_to_mysql(sentiment_results, clear_existing=True)
 
-        if not json_payload or not isinstance(json_payload, dict) or "data" not in json_payload:
-            logger.error("[ERROR] Invalid JSON payload received at /analyze")
-            return jsonify({"error": "Invalid request. JSON body must contain a 'data' field."}), 400
+    report(force=True, stage='done')
 
-        raw_data = json_payload["data"]
+    return _analysis_body(sentiment_results, summary)
 
-        if not isinstance(raw_data, list):
-            logger.error("[ERROR] 'data' field is not a list.")
-            return jsonify({"error": "'data' must be a list."}), 400
+def _analysis_body(sentiment_results, summary):
+    """Response body shared by /analyze, analysis jobs and /collect-and-analyze."""
+    return {
+        "data": [record.to_dict() for record in sentiment_results],
+        **summary.result()
+    }
+
+@app.route('/analyze', methods=['POST'])
+@requires_models
+def analyze_data():
+    try:
+        raw_data, error = _analysis_request_data('/analyze')
+        if error:
+            return error
 
         logger.info(f"[DEBUG] 🔍 Received {len(raw_data)} items for analysis.")
 
-        result_container = {}
+        # Runs in the request thread; use POST /jobs/analyze for long analyses
+        return jsonify(_run_analysis(raw_data))
 
-        def background_analysis():
-            try:
-                processed_data = preprocessor.preprocess_social_media_data(raw_data)
-                sentiment_results = sentiment_analyzer.analyze_social_media_data(processed_data)
-                hashtag_analysis = trend_analyzer.analyze_hashtags(sentiment_results)
+    except Exception as e:
+        logger.error(f"Analysis error: {str(e)}", exc_info=True)
+        return jsonify({'error': f'Analysis failed: {str(e)}'}), 500
 
-                # ✅ Store results in MySQL
-                save_analysis_to_mysql(sentiment_results)
-                # save_analysis_to_mysql(sentiment_results, clear_existing=True)
 
-                result_container['data'] = sentiment_results
-                result_container['hashtag_analysis'] = hashtag_analysis
-            except Exception as e:
-                logger.error(f"Error during background analysis: {str(e)}", exc_info=True)
-                result_container['error'] = str(e)
+@app.route('/jobs/analyze', methods=['POST'])
+@requires_models
+def submit_analysis_job():
+    raw_data, error = _analysis_request_data('/jobs/analyze')
+    if error:
+        return error
 
-        thread = Thread(target=background_analysis)
-        thread.start()
-        thread.join()
+    try:
+        job = job_manager.submit('analyze', lambda job: _run_analysis(raw_data, job))
+    except JobQueueFull as e:
+        logger.warning(f"Rejected analysis job: {str(e)}")
+        return jsonify({'error': 'Too many analysis jobs waiting, try again later'}), 429
+
+    logger.info(f"Queued analysis job {job.id} for {len(raw_data)} items")
+    return jsonify({
+        'job_id': job.id,
+        'state': job.state,
+        'status_url': f'/jobs/{job.id}'
+    }), 202
+
+
+@app.route('/jobs/<job_id>', methods=['GET'])
+def get_job(job_id):
+    job = job_manager.get(job_id)
+    if job is None:
+        return jsonify({'error': 'Job not found or expired'}), 404
+    return jsonify(job.to_dict())
+
+
+@app.route('/jobs/<job_id>/events', methods=['GET'])
+def job_events(job_id):
+    """
+    Server-Sent Events stream of a job's progress: 'progress' events (at most
+    PROGRESS_MAX_RATE per second), then one event named after the final state.
+    """
+    job = job_manager.get(job_id)
+    if job is None:
+        return jsonify({'error': 'Job not found or expired'}), 404
+
+    keepalive = float(os.getenv('SSE_KEEPALIVE_SECONDS', 15))
+
+    def generate():
+        version = 0
+        while True:
+            finished = job.finished
+            version, progress = job.tracker.wait(version, timeout=0 if finished else keepalive)
+            if progress is not None:
+                yield b"event: progress\ndata: " + serialization.dumps({'state': job.state, **progress}) + b"\n\n"
+            if finished:
+                yield f"event: {job.state}\ndata: ".encode() + serialization.dumps(job.to_dict(include_result=False)) + b"\n\n"
+                return
+            if progress is None:
+                yield b": keep-alive\n\n"
+
+    return Response(
+        stream_with_context(generate()),
+        mimetype='text/event-stream',
+        headers={'X-Accel-Buffering': 'no', 'Cache-Control': 'no-cache'}
+    )
+
+
+@app.route('/jobs/<job_id>', methods=['DELETE'])
+def cancel_job(job_id):
+    job = job_manager.cancel(job_id)
+    if job is None:
+        return jsonify({'error': 'Job not found or expired'}), 404
+    if job.finished and job.state != 'cancelled':
+        return jsonify({'error': f'Job already {job.state}', 'job': job.to_dict(include_result=False)}), 409
+    return jsonify(job.to_dict(include_result=False))
+
+
+def create_collector(source, data):
+    """Build the collector for a request's source and credentials."""
+    if source == 'twitter':
+        return TwitterCollector(data.get('twitter_bearer_token'))
+    if source == 'instagram':
+        return InstagramCollector(
+            session_id=data.get('instagram_session_id'),
+            ds_user_id=data.get('instagram_ds_user_id'),
+            csrf_token=data.get('instagram_csrf_token')
+        )
+    raise ValueError(f"Invalid source: {source}. Must be 'twitter' or 'instagram'")
+
+# Looked up per request, so tests can swap in stub collectors
+collector_factory = create_collector
+
+def _collector_pages(collector, source, search_type, query, max_results):
+    """Pages (lists of raw items) for a collection request."""
+    if source == 'twitter':
+        if search_type == 'hashtag':
+            return collector.iter_tweets_by_hashtag(query.lstrip('#'), max_results)
+        if search_type == 'username':
+            return collector.iter_tweets_by_user(query.lstrip('@'), max_results)
+        raise ValueError(f"Invalid search_type: {search_type}. Must be 'hashtag' or 'username'")
+
+    if search_type == 'hashtag':
+        return collector.iter_hashtag_posts(query.lstrip('#'), max_results)
+    if search_type == 'post':
+        return iter([[collector.fetch_post_data(query)]])
+    raise ValueError(f"Invalid Instagram search type: {search_type}")
+
+# Collector output field -> field TextPreprocessor and the analyzers read
+_COLLECTED_FIELDS = {
+    'twitter': {'text': 'tweet_text', 'created_at': 'date_time', 'like_count': 'tweet_like_count',
+                'retweet_count': 'tweet_retweet_count', 'reply_count': 'tweet_reply_count'},
+    'instagram': {'created_at': 'date_time', 'like_count': 'likes_count'}
+}
+
+def _analysis_item(item, source):
+    """A collected item with its fields renamed to the /analyze input schema."""
+    analysis_item = dict(item)
+    for field, analysis_field in _COLLECTED_FIELDS[source].items():
+        if field in item and analysis_field not in item:
+            analysis_item[analysis_field] = item[field]
+    return analysis_item
+
+@app.route('/collect-and-analyze', methods=['POST'])
+@requires_models
+def collect_and_analyze():
+    """
+    /collect followed by /analyze without the client round trip: collector
+    pages are fetched in a background thread and each page is preprocessed
+    and scored while the next one is downloading.
+    """
+    data = request.get_json(force=True, silent=True)
+    if not data or not isinstance(data, dict):
+        return jsonify({'error': 'No data provided'}), 400
+
+    source = data.get('source')
+    query = (data.get('query') or '').strip()
+    search_type = data.get('search_type')
+    if not source:
+        return jsonify({'error': 'Source parameter is required'}), 400
+    if not query:
+        return jsonify({'error': 'Query parameter is required'}), 400
+    try:
+        max_results = int(data.get('max_results', 50))
+    except (TypeError, ValueError):
+        max_results = 0
+    if max_results <= 0:
+        return jsonify({'error': 'max_results must be a positive integer'}), 400
 
-        if 'error' in result_container:
-            return jsonify({'error': f'Analysis failed: {result_container["error"]}'}), 500
+    logger.info(f"Collecting and analyzing {source} data for '{query}', max results: {max_results}")
 
-        sentiment_results = result_container['data']
-        hashtag_analysis = result_container['hashtag_analysis']
+    try:
+        collector = collector_factory(source, data)
+        pages = _collector_pages(collector, source, search_type, query, max_results)
+    except ValueError as ve:
+        logger.warning(f"Invalid collect-and-analyze request: {str(ve)}")
+        return jsonify({'error': str(ve)}), 400
+    except Exception as e:
+        logger.error(f"Collector error: {str(e)}", exc_info=True)
+        return jsonify({'error': f"Error fetching {source} data: {str(e)}"}), 500
 
+    try:
+        collected = 0
+        sentiment_results = []
+        summary = trend_analyzer.analysis_summary()
+        for page in prefetch(pages, depth=int(os.getenv('COLLECT_PREFETCH_PAGES', 2))):
+            page = [_analysis_item(item, source) for item in page if item]
+            collected += len(page)
+            processed_data = preprocessor.preprocess_social_media_data(page, records=True)
+            results = sentiment_service.analyze_social_media_data(processed_data, records=True)
+            summary.update(results)
+            sentiment_results.extend(results)
+
+        save_analysis_to_mysql(sentiment_results)
+
+        logger.info(f"Collected and analyzed {collected} items from {source}")
         return jsonify({
-            "data": sentiment_results,
-            "stats": {
-                "total_analyzed": len(sentiment_results),
-                "sentiment_distribution": {
-                    "positive": sum(1 for x in sentiment_results if x['sentiment'] == "Positive"),
-                    "neutral": sum(1 for x in sentiment_results if x['sentiment'] == "Neutral"),
-                    "negative": sum(1 for x in sentiment_results if x['sentiment'] == "Negative"),
-                },
-                "average_sentiment": round(
-                    sum(x['sentiment_score'] for x in sentiment_results) / max(len(sentiment_results), 1), 3
-                ) if sentiment_results else "NaN"
-            },
-            "sentiment_distribution": {
-                "positive": sum(1 for x in sentiment_results if x['sentiment'] == "Positive"),
-                "neutral": sum(1 for x in sentiment_results if x['sentiment'] == "Neutral"),
-                "negative": sum(1 for x in sentiment_results if x['sentiment'] == "Negative"),
-            },
-            "hashtag_analysis": hashtag_analysis
+            'status': 'success',
+            'source': source,
+            'count': collected,
+            **_analysis_body(sentiment_results, summary)
         })
 
+    except ValueError as ve:
+        # Raised lazily by page generators, e.g. for missing credentials
+        logger.warning(f"Invalid collect-and-analyze request: {str(ve)}")
+        return jsonify({'error': str(ve)}), 400
     except Exception as e:
-        logger.error(f"Analysis error: {str(e)}", exc_info=True)
-        return jsonify({'error': f'Analysis failed: {str(e)}'}), 500
+        logger.error(f"Collect-and-analyze error: {str(e)}", exc_info=True)
+        return jsonify({'error': f'Collect-and-analyze failed: {str(e)}'}), 500
+
+
+@app.route('/analyze/stream', methods=['POST'])
+@requires_models
+def analyze_data_stream():
+    """
+    Streaming /analyze: newline-delimited JSON with one {"type": "result"} row per
+    item, sent as each chunk is scored, then one {"type": "summary"} record.
+    """
+    raw_data, error = _analysis_request_data('/analyze/stream')
+    if error:
+        return error
+
+    # Small chunks get the first rows to the client quickly
+    try:
+        chunk_size = int(request.args.get('chunk_size', os.getenv('ANALYZE_STREAM_CHUNK_SIZE', 64)))
+    except ValueError:
+        chunk_size = 0
+    if chunk_size <= 0:
+        return jsonify({'error': 'chunk_size must be a positive integer'}), 400
+    logger.info(f"Streaming analysis of {len(raw_data)} items in chunks of {chunk_size}")
+
+    def generate():
+        summary = trend_analyzer.analysis_summary()
+
+        # One connection for all chunks of the stream
+        try:
+            conn = connect_mysql()
+        except Exception as e:
+            logger.warning(f"Streamed results will not be saved to MySQL: {str(e)}")
+            conn = None
+
+        try:
+            chunks = stream_analysis(
+                raw_data, preprocessor, sentiment_analyzer,
+                aggregator=summary, chunk_size=chunk_size,
+                predict=sentiment_batcher.predict_texts if sentiment_batcher else None,
+                records=True
+            )
+            for results in chunks:
+                lines = []
+                for record in results:
+                    row = record.to_dict()
+                    row['type'] = 'result'
+                    lines.append(serialization.dumps(row))
+                yield b'\n'.join(lines) + b'\n'
+
+                if conn is not None:
+                    save_analysis_to_mysql(results, conn=conn)
+
+            yield serialization.dumps({"type": "summary", **summary.result()}) + b'\n'
+
+        except Exception as e:
+            # Headers are already sent, so report the failure in-band
+            logger.error(f"Streaming analysis error: {str(e)}", exc_info=True)
+            yield serialization.dumps({"type": "error", "error": f"Analysis failed: {str(e)}"}) + b'\n'
+
+        finally:
+            if conn is not None:
+                conn.close()
+
+    return Response(
+        stream_with_context(generate()),
+        mimetype='application/x-ndjson',
+        headers={'X-Accel-Buffering': 'no', 'Cache-Control': 'no-cache'}
+    )
 
 
 @app.route('/trends', methods=['POST'])
 def analyze_trends():
     try:
-        data = request.json.get('data', [])
+        body = request.get_json(silent=True)
+        data = body.get('data', []) if isinstance(body, dict) else None
         if not data:
             logger.warning("No data provided for trend analysis")
             return jsonify({'error': 'No data provided for trend analysis'}), 400
         
         logger.info(f"Analyzing trends for {len(data)} items")
-        trends = trend_analyzer.analyze_hashtags(data)
+        summary = trend_analyzer.summarize(data)
         logger.info("Trend analysis completed successfully")
-        return jsonify({'status': 'success', 'trends': trends})
+        return jsonify({'status': 'success', 'trends': summary.hashtags.result(), 'stats': summary.stats()})
+    except ValueError as ve:
+        logger.warning(f"Invalid trends request: {str(ve)}")
+        return jsonify({'error': str(ve)}), 400
     except Exception as e:
         error_trace = traceback.format_exc()
         logger.error(f"Error in analyze_trends: {error_trace}")
@@ -415,11 +777,64 @@ def after_request(response):
     response.headers.add('Access-Control-Allow-Methods', 'GET,PUT,POST,DELETE,OPTIONS')
     return response
 
+COMPRESSIBLE_MIMETYPES = {'application/json', 'text/plain', 'text/html', 'text/csv'}
+
+@app.after_request
+def compress_response(response):
+    """gzip/brotli-encode buffered responses the client accepts; streams and files pass through."""
+    if os.getenv('RESPONSE_COMPRESSION', '1') == '0':
+        return response
+    if (response.direct_passthrough or response.is_streamed
+            or response.status_code < 200 or response.status_code in (204, 304)
+            or 'Content-Encoding' in response.headers
+            or response.mimetype not in COMPRESSIBLE_MIMETYPES):
+        return response
+
+    response.vary.add('Accept-Encoding')
+    body = response.get_data()
+    if len(body) < int(os.getenv('RESPONSE_COMPRESS_MIN_BYTES', 1024)):
+        return response
+    encoding = serialization.negotiate_encoding(request.headers.get('Accept-Encoding'))
+    if encoding is None:
+        return response
+
+    response.set_data(serialization.compress(body, encoding))
+    response.headers['Content-Encoding'] = encoding
+    return response
+
+@app.route('/stats/sentiment', methods=['GET'])
+@requires_models
+def sentiment_stats():
+    return jsonify({
+        'batching': sentiment_batcher.stats() if sentiment_batcher else None,
+        'workers': sentiment_analyzer.worker_pool.health_check() if sentiment_analyzer.worker_pool else None,
+        'cache': sentiment_analyzer.cache.stats() if sentiment_analyzer.cache else None,
+        'last_batch': sentiment_analyzer.last_batch_stats,
+        'last_dedup': sentiment_analyzer.last_dedup_stats
+    })
+
+@app.route('/stats/preprocessing', methods=['GET'])
+@requires_models
+def preprocessing_stats():
+    return jsonify({
+        'cache': preprocessor.cache_stats()
+    })
+
 @app.route('/ping', methods=['GET'])
 def ping():
-    return jsonify({'status': 'ok'}), 200
+    # Liveness only: answers immediately, even while models are loading
+    return jsonify({'status': 'ok', 'ready': initializer.ready}), 200
+
+@app.route('/ready', methods=['GET'])
+def ready():
+    status = initializer.status()
+    return jsonify(status), 200 if status['ready'] else 503
 
 if __name__ == '__main__':
     logger.info("Starting Flask server")
+    # debug=True re-runs this script in a reloader child that serves the
+    # requests; load the models there rather than in the watching parent
+    if os.environ.get('WERKZEUG_RUN_MAIN') == 'true':
+        initializer.start()
     app.run(host='0.0.0.0', port=5000, debug=True)
 
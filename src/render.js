@@ -170,6 +170,77 @@ document.addEventListener('DOMContentLoaded', async () => {
     updateStatus('Ready');
 });
 
+// How often and how long to wait for the server to finish loading its models
+const SERVER_READY_POLL_MS = 2000;
+const SERVER_READY_TIMEOUT_MS = 5 * 60 * 1000;
+
+// Raised when /analyze keeps answering 503 because the models never finished loading
+class ServerNotReadyError extends Error {}
+
+function sleep(ms) {
+    return new Promise(resolve => setTimeout(resolve, ms));
+}
+
+// Poll /ready until the server has loaded its models; false on timeout or failed startup
+async function waitForServerReady(timeoutMs = SERVER_READY_TIMEOUT_MS) {
+    const deadline = Date.now() + timeoutMs;
+    while (Date.now() < deadline) {
+        try {
+            const response = await fetch(`${SERVER_URL}/ready`, { method: 'GET' });
+            // Servers without /ready only answer once they are ready
+            if (response.ok || response.status === 404) return true;
+            const status = await response.json().catch(() => ({}));
+            if (status.state === 'failed') {
+                logMessage(`Server failed to load models: ${status.error}`, 'error');
+                return false;
+            }
+        } catch (error) {
+            // Not reachable yet; keep polling
+        }
+        await sleep(SERVER_READY_POLL_MS);
+    }
+    return false;
+}
+
+// /ping answers while models are still loading; only report "connected" once they are ready
+async function handlePingResponse(response) {
+    if (!response.ok) {
+        updateServerStatus('error');
+        appState.serverStatus = 'error';
+        logMessage('Flask server returned an error response', 'error');
+        return;
+    }
+
+    const status = await response.json().catch(() => ({}));
+    if (status.ready === false) {
+        appState.serverStatus = 'loading';
+        logMessage('Flask server is running, waiting for models to load...', 'info');
+        if (!(await waitForServerReady())) {
+            updateServerStatus('error');
+            appState.serverStatus = 'error';
+            logMessage('Flask server did not finish loading its models', 'error');
+            return;
+        }
+    }
+
+    updateServerStatus('connected');
+    appState.serverStatus = 'connected';
+    logMessage('Flask server is running and connected', 'info');
+}
+
+// POST a batch to /analyze, waiting out 503s while the server is still loading models
+async function postAnalyzeBatch(url, options) {
+    while (true) {
+        const response = await fetch(url, options);
+        if (response.status !== 503) return response;
+
+        logMessage('Server is still loading models, waiting before analyzing...', 'info');
+        if (!(await waitForServerReady())) {
+            throw new ServerNotReadyError('Server is not ready to analyze yet, try again later');
+        }
+    }
+}
+
 // Check Flask server status
 async function checkServerStatus() {
     console.log('Checking server status at:', SERVER_URL);
@@ -184,15 +255,7 @@ async function checkServerStatus() {
         
         console.log('Server ping response:', response.status, response.statusText);
 
-        if (response.ok) {
-            updateServerStatus('connected');
-            appState.serverStatus = 'connected';
-            logMessage('Flask server is running and connected', 'info');
-        } else {
-            updateServerStatus('error');
-            appState.serverStatus = 'error';
-            logMessage('Flask server returned an error response', 'error');
-        }
+        await handlePingResponse(response);
     } catch (error) {
         updateServerStatus('disconnected');
         appState.serverStatus = 'disconnected';
@@ -2122,7 +2185,7 @@ async function robustFetch(url, options, retries = MAX_RETRIES) {
 async function analyzeBatch(data) {
     try {
         console.log('Sending batch to analyze:', data.length, 'items');
-        const response = await fetch(`${SERVER_URL}/analyze`, {
+        const response = await postAnalyzeBatch(`${SERVER_URL}/analyze`, {
             method: 'POST',
             headers: { 'Content-Type': 'application/json' },
             body: JSON.stringify({ data })
@@ -2131,6 +2194,7 @@ async function analyzeBatch(data) {
         if (!response.ok) throw new Error(`HTTP error! status: ${response.status}`);
         return await response.json();
     } catch (error) {
+        if (error instanceof ServerNotReadyError) throw error;
         console.error('Batch analysis failed:', error);
         return {
             data: [],
@@ -2163,6 +2227,14 @@ async function runAnalysis() {
   
       progressContainer.style.display = "block";
       progressBar.style.width = "0%";
+
+      // The server answers /ping before its models are loaded (e.g. right after launch)
+      if (appState.serverStatus !== 'connected') {
+        progressText.textContent = "Waiting for the server to load models...";
+        if (!(await waitForServerReady())) {
+          throw new ServerNotReadyError("Server is not ready to analyze yet, try again later");
+        }
+      }
       progressText.textContent = `Analyzing 0 of ${combinedData.length}`;
   
     const batchSize = 1000;
@@ -2757,7 +2829,7 @@ async function testServerConnection() {
 
   async function analyzeBatch(data) {
     try {
-        const response = await fetch('http://localhost:5000/analyze', {
+        const response = await postAnalyzeBatch('http://localhost:5000/analyze', {
             method: 'POST',
             headers: {
                 'Content-Type': 'application/json',
@@ -2772,6 +2844,7 @@ async function testServerConnection() {
         }
         return await response.json();
     } catch (error) {
+        if (error instanceof ServerNotReadyError) throw error;
         console.error('Analysis failed:', error);
         // Return a valid empty structure to prevent UI crashes
         return {
@@ -3526,15 +3599,7 @@ async function checkServerStatus() {
         
         console.log('Server response:', response.status, response.statusText);  // Add this log
         
-        if (response.ok) {
-            updateServerStatus('connected');
-            appState.serverStatus = 'connected';
-            logMessage('Flask server is running and connected', 'info');
-        } else {
-            updateServerStatus('error');
-            appState.serverStatus = 'error';
-            logMessage('Flask server returned an error response', 'error');
-        }
+        await handlePingResponse(response);
     } catch (error) {
         console.error('Server connection error:', error);  // Add this log
         updateServerStatus('disconnected');
@@ -0,0 +1,120 @@
+# tests/test_collect_and_analyze.py
+#
+# /collect-and-analyze with stub collectors (via flask_server.collector_factory)
+# and a stub sentiment service, so no network access or model is needed.
+
+from datetime import datetime, timezone
+from types import SimpleNamespace
+
+import pytest
+
+for _module in ("tweepy", "instaloader", "mysql.connector", "backend.config"):
+    pytest.importorskip(_module)
+
+import flask_server
+from backend.data_collection import TwitterCollector
+from backend.records import SentimentRecord
+from backend.text_processor import TextPreprocessor
+
+
+def _tweet(tweet_id, text, likes, retweets):
+    return SimpleNamespace(
+        id=tweet_id,
+        text=text,
+        created_at=datetime(2025, 4, 23, 7, 24, 18, tzinfo=timezone.utc),
+        public_metrics={'like_count': likes, 'retweet_count': retweets, 'reply_count': 0}
+    )
+
+
+# Pages exactly as TwitterCollector._iter_pages builds them
+TWEET_PAGES = [
+    [TwitterCollector._tweet_to_dict(_tweet(1, "I love the new #Python release! https://t.co/x", 10, 2)),
+     TwitterCollector._tweet_to_dict(_tweet(2, "@dev this bug is terrible #python", 3, 0))],
+    [TwitterCollector._tweet_to_dict(_tweet(3, "RT so happy with #Flask today", 7, 1))],
+]
+
+
+class StubTwitterCollector:
+    def iter_tweets_by_hashtag(self, hashtag, max_results=50):
+        return iter(TWEET_PAGES)
+
+
+class ReadyInitializer:
+    ready = True
+
+    def start(self):
+        return self
+
+
+class StubSentimentService:
+    """Scores by keyword and remembers the cleaned texts it was given."""
+
+    def __init__(self):
+        self.cleaned_texts = []
+
+    def analyze_social_media_data(self, data, records=False):
+        results = []
+        for item in data:
+            self.cleaned_texts.append(item.cleaned_text)
+            positive = any(word in (item.cleaned_text or "") for word in ("love", "happy"))
+            results.append(SentimentRecord(
+                id=item.id, platform=item.platform, text=item.original_text or "",
+                username=item.username, timestamp=item.timestamp,
+                sentiment="Positive" if positive else "Negative",
+                sentiment_score=0.9 if positive else -0.9,
+                hashtags=item.hashtags, likes=item.likes, shares=item.shares
+            ))
+        return results
+
+
+@pytest.fixture
+def service(monkeypatch):
+    service = StubSentimentService()
+    monkeypatch.setattr(flask_server, "initializer", ReadyInitializer())
+    monkeypatch.setattr(flask_server, "preprocessor", TextPreprocessor())
+    monkeypatch.setattr(flask_server, "sentiment_service", service)
+    monkeypatch.setattr(flask_server, "save_analysis_to_mysql", lambda *args, **kwargs: None)
+    monkeypatch.setattr(flask_server, "collector_factory", lambda source, data: StubTwitterCollector())
+    return service
+
+
+def test_twitter_pages_are_scored_on_their_text(service):
+    response = flask_server.app.test_client().post('/collect-and-analyze', json={
+        'source': 'twitter', 'search_type': 'hashtag', 'query': '#python', 'max_results': 3
+    })
+
+    assert response.status_code == 200
+    body = response.get_json()
+    assert body['count'] == 3
+    preprocessor = flask_server.preprocessor
+    expected = [preprocessor.preprocess_text(item['text']) for page in TWEET_PAGES for item in page]
+    assert all(expected)
+    assert service.cleaned_texts == expected
+
+    first = body['data'][0]
+    assert first['text'] == "I love the new #Python release! https://t.co/x"
+    assert first['platform'] == 'twitter'
+    assert first['hashtags'] == ['python']
+    assert first['timestamp'] == "2025-04-23T07:24:18+00:00"
+    assert first['metrics'] == {'likes': 10, 'shares': 2}
+
+    assert [row['sentiment'] for row in body['data']] == ['Positive', 'Negative', 'Positive']
+    assert body['sentiment_distribution'] == {'positive': 2, 'neutral': 0, 'negative': 1}
+
+
+def test_invalid_search_type_is_rejected(service):
+    response = flask_server.app.test_client().post('/collect-and-analyze', json={
+        'source': 'twitter', 'search_type': 'likes', 'query': 'python'
+    })
+
+    assert response.status_code == 400
+
+
+@pytest.mark.parametrize("max_results", ["many", None, 0, -5])
+def test_invalid_max_results_is_rejected(service, max_results):
+    response = flask_server.app.test_client().post('/collect-and-analyze', json={
+        'source': 'twitter', 'search_type': 'hashtag', 'query': 'python', 'max_results': max_results
+    })
+
+    assert response.status_code == 400
+    assert response.get_json() == {'error': 'max_results must be a positive integer'}
@@ -0,0 +1,137 @@
+# tests/test_grok_rate_limit.py
+#
+# GrokSentimentAnalyzer against a local stub of the completions API
+# (via base_url): retries after 429 + Retry-After, and pacing that comes
+# from the rate-limit response headers rather than a client-side rate.
+
+import json
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+for _module in ("torch", "transformers"):
+    pytest.importorskip(_module)
+
+from backend.sentiment_analysis import GrokSentimentAnalyzer, TokenBucket
+
+
+class StubCompletions:
+    """Completions endpoint that answers the first `throttle_first` requests with 429."""
+
+    def __init__(self, throttle_first=0, retry_after="0.3", rate_headers=None):
+        self.throttle_first = throttle_first
+        self.retry_after = retry_after
+        self.rate_headers = rate_headers or {}
+        self.request_times = []
+        self._lock = threading.Lock()
+
+        stub = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_POST(self):
+                body = json.loads(self.rfile.read(int(self.headers['Content-Length'])))
+                with stub._lock:
+                    stub.request_times.append(time.monotonic())
+                    throttled = len(stub.request_times) <= stub.throttle_first
+
+                if throttled:
+                    self.send_response(429)
+                    self.send_header('Retry-After', stub.retry_after)
+                    self.send_header('Content-Length', '0')
+                    self.end_headers()
+                    return
+
+                prompt = body['messages'][-1]['content']
+                count = sum(1 for line in prompt.splitlines() if line.startswith('Text '))
+                content = json.dumps([{"sentiment": "Positive", "score": 0.5}] * count)
+                payload = json.dumps({"choices": [{"message": {"content": content}}]}).encode()
+                self.send_response(200)
+                for name, value in stub.rate_headers.items():
+                    self.send_header(name, value)
+                self.send_header('Content-Type', 'application/json')
+                self.send_header('Content-Length', str(len(payload)))
+                self.end_headers()
+                self.wfile.write(payload)
+
+            def log_message(self, *args):
+                pass
+
+        self.server = ThreadingHTTPServer(('127.0.0.1', 0), Handler)
+        self.base_url = f"http://127.0.0.1:{self.server.server_port}"
+        threading.Thread(target=self.server.serve_forever, daemon=True).start()
+
+    def close(self):
+        self.server.shutdown()
+        self.server.server_close()
+
+
+@pytest.fixture
+def stub_factory():
+    stubs = []
+
+    def make(**kwargs):
+        stub = StubCompletions(**kwargs)
+        stubs.append(stub)
+        return stub
+
+    yield make
+    for stub in stubs:
+        stub.close()
+
+
+def test_bucket_takes_rate_and_capacity_from_headers():
+    bucket = TokenBucket()
+    assert bucket.rate is None
+
+    bucket.update_from_headers({
+        'x-ratelimit-limit-requests': '60',
+        'x-ratelimit-remaining-requests': '59',
+        'x-ratelimit-reset-requests': '1s'
+    })
+
+    assert bucket.rate == pytest.approx(1.0)
+    assert bucket.capacity == 60
+    assert bucket.tokens == pytest.approx(59, abs=0.1)
+
+
+def test_retry_after_is_honoured_then_batch_succeeds(stub_factory):
+    stub = stub_factory(throttle_first=1, retry_after="0.3")
+    analyzer = GrokSentimentAnalyzer("test-key", base_url=stub.base_url, max_concurrency=1, backoff=0.01)
+
+    results = analyzer.analyze_batch([f"text {i}" for i in range(5)], batch_size=5)
+
+    assert results == [{"sentiment": "Positive", "score": 0.5}] * 5
+    assert len(stub.request_times) == 2
+    assert stub.request_times[1] - stub.request_times[0] >= 0.3
+
+
+def test_no_client_side_cap_without_rate_limit_headers(stub_factory):
+    stub = stub_factory()
+    analyzer = GrokSentimentAnalyzer("test-key", base_url=stub.base_url, max_concurrency=4)
+
+    started = time.monotonic()
+    results = analyzer.analyze_batch([f"text {i}" for i in range(400)], batch_size=10)
+    elapsed = time.monotonic() - started
+
+    assert len(results) == 400
+    assert len(stub.request_times) == 40
+    # A fixed 2 requests/second would need ~20s for 40 batches
+    assert elapsed < 5
+
+
+def test_pacing_follows_advertised_limit(stub_factory):
+    # 5 of 10 requests used, full budget back in 1s: 5 requests/second
+    stub = stub_factory(rate_headers={
+        'x-ratelimit-limit-requests': '10',
+        'x-ratelimit-remaining-requests': '5',
+        'x-ratelimit-reset-requests': '1s'
+    })
+    analyzer = GrokSentimentAnalyzer("test-key", base_url=stub.base_url, max_concurrency=1)
+
+    analyzer.analyze_batch([f"text {i}" for i in range(110)], batch_size=10)
+
+    assert analyzer.rate_limiter.rate == pytest.approx(5.0)
+    # After the first response: 5 tokens left, then 5 more at 5/s -> ~1s for 11 requests
+    assert stub.request_times[-1] - stub.request_times[0] >= 0.8
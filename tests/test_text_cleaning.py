@@ -0,0 +1,30 @@
+# tests/test_text_cleaning.py
+#
+# Parity of the fused cleaning passes with the original clean_text, and of
+# clean_and_extract with extract_hashtags + preprocess_text, over the corpus
+# in benchmarks/text_cleaning.py (which keeps the timing code).
+
+import pytest
+
+from benchmarks.text_cleaning import (
+    PARITY_CORPUS, check_extract_parity, check_parity, generated_corpus
+)
+from backend.text_processor import TextPreprocessor
+
+CORPUS = PARITY_CORPUS + generated_corpus()
+
+
+@pytest.fixture(scope="module")
+def preprocessor():
+    # Bundled stopwords when NLTK data is missing; never download during tests
+    with pytest.MonkeyPatch.context() as monkeypatch:
+        monkeypatch.setenv("NLTK_OFFLINE", "1")
+        yield TextPreprocessor().prepare()
+
+
+def test_clean_text_matches_legacy_passes(preprocessor):
+    assert check_parity(preprocessor, CORPUS) == 0
+
+
+def test_clean_and_extract_matches_two_pass_path(preprocessor):
+    assert check_extract_parity(preprocessor, CORPUS) == 0
@@ -0,0 +1,57 @@
+# tests/test_trends.py
+#
+# TrendAnalyzer.summarize and /trends on malformed but valid JSON: bad
+# comments, tags and scores are skipped or coerced, invalid input is a 400.
+
+import pytest
+
+from backend.trend_analysis import TrendAnalyzer
+
+MALFORMED = [
+    {'hashtags': ['Python', 42], 'sentiment_score': '0.5', 'like_count': '3',
+     'comments': ['not a comment', {'hashtags': ['python'], 'sentiment_score': 'high'}]},
+    {'hashtags': ['python'], 'sentiment_score': 0.9, 'like_count': 1},
+]
+
+
+def test_summarize_skips_or_coerces_bad_fields():
+    summary = TrendAnalyzer().summarize(MALFORMED)
+
+    assert summary.total == 2
+    assert summary.sentiment_distribution() == {'positive': 2, 'neutral': 0, 'negative': 0}
+    assert summary.stats()['average_sentiment'] == 0.7
+
+    # Tag 42 and the non-dict comment are skipped; the comment's 'high' score is not counted
+    assert summary.hashtags.counts == {'python': 3}
+    assert summary.hashtags.totals['python'][:3] == pytest.approx([1.4, 2, 4])
+
+
+@pytest.mark.parametrize("data", [{'hashtags': ['python']}, "python", [{'hashtags': []}, "python"]])
+def test_summarize_rejects_invalid_input(data):
+    with pytest.raises(ValueError):
+        TrendAnalyzer().summarize(data)
+
+
+@pytest.fixture
+def client():
+    for module in ("tweepy", "instaloader", "mysql.connector", "backend.config"):
+        pytest.importorskip(module)
+    import flask_server
+    return flask_server.app.test_client()
+
+
+def test_trends_endpoint_tolerates_malformed_items(client):
+    response = client.post('/trends', json={'data': MALFORMED})
+
+    assert response.status_code == 200
+    body = response.get_json()
+    assert body['stats']['total_analyzed'] == 2
+    assert body['trends']['top_hashtags'][0]['hashtag'] == 'python'
+
+
+@pytest.mark.parametrize("payload", [{'data': {'hashtags': ['python']}}, {'data': 'python'}, [1, 2]])
+def test_trends_endpoint_rejects_invalid_input(client, payload):
+    response = client.post('/trends', json=payload)
+
+    assert response.status_code == 400
+    assert 'error' in response.get_json()